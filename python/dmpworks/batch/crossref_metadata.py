@@ -1,19 +1,44 @@
 import logging
-from typing import TYPE_CHECKING
+import pathlib
 
 from dmpworks.batch.tasks import dataset_subset_task, download_source_task, transform_parquets_task
-from dmpworks.batch.utils import s3_uri
+from dmpworks.batch.utils import S5CMD_CONCURRENCY, S5CMD_PART_SIZE_MB, s3_uri
 from dmpworks.cli_utils import CrossrefMetadataTransformConfig, DatasetSubsetAWS
 from dmpworks.transform.crossref_metadata import transform_crossref_metadata
 from dmpworks.transform.dataset_subset import create_dataset_subset
-from dmpworks.utils import run_process
-
-if TYPE_CHECKING:
-    import pathlib
+from dmpworks.utils import run_piped_process
 
 log = logging.getLogger(__name__)
 
 DATASET = "crossref-metadata"
+TAR_BLOCKING_FACTOR = 1024  # 512 KiB records, rather than the 10 KiB default
+
+
+def tar_extract_args(file_name: str, target_dir: pathlib.Path) -> list[str]:
+    """Build the tar command that extracts an archive streamed on stdin into a directory.
+
+    Gzipped archives are decompressed with pigz.
+
+    Args:
+        file_name: Name of the archive, used to detect whether it is compressed.
+        target_dir: Directory to extract the archive into.
+
+    Returns:
+        The tar command and arguments.
+    """
+    args = [
+        "tar",
+        "-xf",
+        "-",
+        "-C",
+        str(target_dir),
+        "--strip-components",
+        "1",
+        f"--blocking-factor={TAR_BLOCKING_FACTOR}",
+    ]
+    if file_name.endswith((".tar.gz", ".tgz")):
+        args.append("--use-compress-program=pigz")
+    return args
 
 
 def download(*, bucket_name: str, run_id: str, file_name: str, crossref_bucket_name: str):
@@ -26,29 +51,25 @@ def download(*, bucket_name: str, run_id: str, file_name: str, crossref_bucket_n
         crossref_bucket_name: Name of the Crossref AWS S3 bucket.
     """
     with download_source_task(bucket_name, DATASET, run_id) as ctx:
-        # Download archive
-        run_process(
+        # Stream the archive from S3 straight into tar, so that it is never written to disk.
+        # Untar it here because it is much faster to upload and download many
+        # smaller files, rather than one large file.
+        ctx.download_dir.mkdir(parents=True, exist_ok=True)
+        run_piped_process(
             [
                 "s5cmd",
                 "--request-payer",
                 "requester",
-                "cp",
+                "cat",
+                "--concurrency",
+                str(S5CMD_CONCURRENCY),
+                "--part-size",
+                str(S5CMD_PART_SIZE_MB),
                 s3_uri(crossref_bucket_name, file_name),
-                f"{ctx.download_dir}/",
             ],
+            tar_extract_args(file_name, ctx.download_dir),
         )
 
-        # Extract archive and cleanup
-        # Untar it here because it is much faster to upload and download many
-        # smaller files, rather than one large file.
-        archive_path: pathlib.Path = ctx.download_dir / file_name
-        run_process(
-            ["tar", "-xvf", str(archive_path), "-C", str(ctx.download_dir), "--strip-components", "1"],
-        )
-
-        # Cleanup
-        archive_path.unlink(missing_ok=True)
-
 
 def dataset_subset(
     *,
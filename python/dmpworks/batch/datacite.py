@@ -1,16 +1,27 @@
+from functools import partial
 import logging
 import os
 
-from dmpworks.batch.tasks import dataset_subset_task, download_source_task, transform_parquets_task
-from dmpworks.batch.utils import s3_uri
+import boto3
+
+from dmpworks.batch.tasks import (
+    dataset_subset_task,
+    download_source_shards,
+    download_source_task,
+    transform_parquets_task,
+)
+from dmpworks.batch.utils import S5CMD_NUMWORKERS, list_s3_children, run_s5cmd_batch, s3_uri
 from dmpworks.cli_utils import DataCiteTransformConfig, DatasetSubsetAWS
 from dmpworks.transform.datacite import transform_datacite
 from dmpworks.transform.dataset_subset import create_dataset_subset
-from dmpworks.utils import fetch_datacite_aws_credentials, run_process
+from dmpworks.utils import fetch_datacite_aws_credentials, run_concurrently, run_process
 
 log = logging.getLogger(__name__)
 
 DATASET = "datacite"
+DOWNLOAD_SHARDS = 16
+TRANSFORM_SHARDS = 8
+S5CMD_ENV_VARS = ("PATH", "HOME", "TMPDIR", "AWS_REGION", "AWS_DEFAULT_REGION")
 
 
 def download(*, bucket_name: str, run_id: str, datacite_bucket_name: str):
@@ -23,7 +34,8 @@ def download(*, bucket_name: str, run_id: str, datacite_bucket_name: str):
     """
     # Fetch DataCite AWS credentials
     access_key_id, secret_access_key, session_token = fetch_datacite_aws_credentials()
-    env = os.environ.copy()
+    # Only pass s5cmd what it needs, so that no other AWS credentials are inherited
+    env = {key: os.environ[key] for key in S5CMD_ENV_VARS if key in os.environ}
     env.update(
         {
             "AWS_ACCESS_KEY_ID": access_key_id,
@@ -32,17 +44,40 @@ def download(*, bucket_name: str, run_id: str, datacite_bucket_name: str):
         }
     )
 
-    # Download release
+    # Download release. List the dois/ sub-prefixes first and copy each with its own
+    # s5cmd process, so that listing and downloading happen in parallel across prefixes.
+    # Objects directly under dois/ are copied alongside them in one more s5cmd process.
+    s3_client = boto3.client(
+        "s3",
+        aws_access_key_id=access_key_id,
+        aws_secret_access_key=secret_access_key,
+        aws_session_token=session_token,
+    )
+    source_uri = s3_uri(datacite_bucket_name, "dois") + "/"
+    prefixes, objects = list_s3_children(source_uri, s3_client=s3_client)
+    if not prefixes and not objects:
+        raise RuntimeError(f"No DataCite files found at {source_uri}")
+
     with download_source_task(bucket_name, DATASET, run_id) as ctx:
-        run_process(
-            [
-                "s5cmd",
-                "cp",
-                s3_uri(datacite_bucket_name, "dois/*"),
-                f"{ctx.download_dir}/",
-            ],
-            env=env,
-        )
+
+        def download_prefix(prefix: str):
+            run_process(
+                [
+                    "s5cmd",
+                    "--numworkers",
+                    str(max(1, S5CMD_NUMWORKERS // DOWNLOAD_SHARDS)),
+                    "cp",
+                    f"{prefix}*",
+                    f"{ctx.download_dir / prefix.removeprefix(source_uri)}/",
+                ],
+                env=env,
+            )
+
+        downloads = [partial(download_prefix, prefix) for prefix in prefixes]
+        if objects:
+            commands = [["cp", obj, f"{ctx.download_dir}/{obj.removeprefix(source_uri)}"] for obj in objects]
+            downloads.append(partial(run_s5cmd_batch, commands, env=env))
+        run_concurrently(*downloads, max_workers=DOWNLOAD_SHARDS)
 
 
 def dataset_subset(
@@ -96,11 +131,16 @@ def transform(
         log_level: Python log level.
     """
     with transform_parquets_task(
-        bucket_name, DATASET, run_id, use_subset=use_subset, source_run_id=source_run_id
+        bucket_name, DATASET, run_id, use_subset=use_subset, source_run_id=source_run_id, download=False
     ) as ctx:
-        transform_datacite(
-            in_dir=ctx.download_dir,
-            out_dir=ctx.transform_dir,
-            **vars(config),
-            log_level=log_level,
-        )
+        # Each shard continues the batch numbering of the previous one, so that the output
+        # filenames are unique and still match the datacite_batch_*_part_* pattern read by SQLMesh
+        batch_offset = 0
+        for shard_dir in download_source_shards(ctx, TRANSFORM_SHARDS):
+            batch_offset += transform_datacite(
+                in_dir=shard_dir,
+                out_dir=ctx.transform_dir,
+                **vars(config),
+                batch_offset=batch_offset,
+                log_level=log_level,
+            )
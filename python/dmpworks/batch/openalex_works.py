@@ -1,7 +1,12 @@
 import logging
 
-from dmpworks.batch.tasks import dataset_subset_task, download_source_task, transform_parquets_task
-from dmpworks.batch.utils import s3_uri
+from dmpworks.batch.tasks import (
+    dataset_subset_task,
+    download_source_shards,
+    download_source_task,
+    transform_parquets_task,
+)
+from dmpworks.batch.utils import S5CMD_CONCURRENCY, S5CMD_NUMWORKERS, s3_uri
 from dmpworks.cli_utils import DatasetSubsetAWS, OpenAlexWorksTransformConfig
 from dmpworks.transform.dataset_subset import create_dataset_subset
 from dmpworks.transform.openalex_works import transform_openalex_works
@@ -10,6 +15,7 @@ from dmpworks.utils import run_process
 log = logging.getLogger(__name__)
 
 DATASET = "openalex-works"
+TRANSFORM_SHARDS = 8
 
 
 def download(*, bucket_name: str, run_id: str, openalex_bucket_name: str):
@@ -25,7 +31,11 @@ def download(*, bucket_name: str, run_id: str, openalex_bucket_name: str):
             [
                 "s5cmd",
                 "--no-sign-request",
+                "--numworkers",
+                str(S5CMD_NUMWORKERS),
                 "cp",
+                "--concurrency",
+                str(S5CMD_CONCURRENCY),
                 s3_uri(openalex_bucket_name, "data/works/*"),
                 f"{ctx.download_dir}/",
             ],
@@ -83,11 +93,16 @@ def transform(
         log_level: Python log level.
     """
     with transform_parquets_task(
-        bucket_name, DATASET, run_id, use_subset=use_subset, source_run_id=source_run_id
+        bucket_name, DATASET, run_id, use_subset=use_subset, source_run_id=source_run_id, download=False
     ) as ctx:
-        transform_openalex_works(
-            in_dir=ctx.download_dir,
-            out_dir=ctx.transform_dir,
-            **vars(config),
-            log_level=log_level,
-        )
+        # Each shard continues the batch numbering of the previous one, so that the output
+        # filenames are unique and still match the openalex_works_batch_*_part_* pattern read by SQLMesh
+        batch_offset = 0
+        for shard_dir in download_source_shards(ctx, TRANSFORM_SHARDS):
+            batch_offset += transform_openalex_works(
+                in_dir=shard_dir,
+                out_dir=ctx.transform_dir,
+                **vars(config),
+                batch_offset=batch_offset,
+                log_level=log_level,
+            )
@@ -1,10 +1,17 @@
+from collections.abc import Generator
+from contextlib import closing
+from functools import partial
 import logging
-import shutil
+import pathlib
 
 from dmpworks.batch.utils import (
     download_file_from_s3,
     download_files_from_s3,
+    fast_rmtree,
+    list_s3_objects,
     local_path,
+    prefetch_groups,
+    run_s5cmd_batch,
     s3_uri,
     upload_files_to_s3,
 )
@@ -18,12 +25,15 @@ from dmpworks.cli_utils import (
     OpenSearchSyncConfig,
 )
 from dmpworks.dataset_subset import load_dois, load_institutions
+from dmpworks.utils import run_concurrently, to_batches
 
 log = logging.getLogger(__name__)
 
 MATCHES_DIR = "matches"
 META_DIR = "meta"
 DATASET = "opensearch"
+# Match files are small, so many are fetched with each s5cmd process
+MATCHES_GROUP_SIZE = 256
 
 
 def load_dmp_subset_from_s3(
@@ -44,18 +54,24 @@ def load_dmp_subset_from_s3(
     use_subset = dmp_subset is not None and dmp_subset.enable
     institutions = None
     dois = None
+    institutions_path = meta_dir / "institutions.json"
+    dois_path = meta_dir / "dois.json"
+
+    # Download institutions and DOIs concurrently
+    downloads = []
+    if use_subset and dmp_subset.institutions_s3_path is not None:
+        downloads.append(
+            partial(download_file_from_s3, s3_uri(bucket_name, dmp_subset.institutions_s3_path), institutions_path)
+        )
+    if use_subset and dmp_subset.dois_s3_path is not None:
+        downloads.append(partial(download_file_from_s3, s3_uri(bucket_name, dmp_subset.dois_s3_path), dois_path))
+    run_concurrently(*downloads)
 
     if use_subset and dmp_subset.institutions_s3_path is not None:
-        institutions_uri = s3_uri(bucket_name, dmp_subset.institutions_s3_path)
-        institutions_path = meta_dir / "institutions.json"
-        download_file_from_s3(institutions_uri, institutions_path)
         institutions = load_institutions(institutions_path)
         logging.info(f"institutions: {institutions}")
 
     if use_subset and dmp_subset.dois_s3_path is not None:
-        dois_uri = s3_uri(bucket_name, dmp_subset.dois_s3_path)
-        dois_path = meta_dir / "dois.json"
-        download_file_from_s3(dois_uri, dois_path)
         dois = load_dois(dois_path)
         logging.info(f"dois: {dois}")
 
@@ -90,13 +106,13 @@ def sync_works_cmd(
     works_index_export = local_path(PROCESS_WORKS_SQLMESH, sqlmesh_run_id, "works_index_export")
     doi_state_export = local_path(PROCESS_WORKS_SQLMESH, sqlmesh_run_id, "doi_state_export")
     try:
-        # Download Works Index Parquet files from S3
+        # Download Works Index and DOI State Parquet files from S3 concurrently
         works_index_source_uri = s3_uri(bucket_name, PROCESS_WORKS_SQLMESH, sqlmesh_run_id, "works_index_export/*")
-        download_files_from_s3(works_index_source_uri, works_index_export)
-
-        # Download DOI State Parquet files from S3
         doi_state_source_uri = s3_uri(bucket_name, PROCESS_WORKS_SQLMESH, sqlmesh_run_id, "doi_state_export/*")
-        download_files_from_s3(doi_state_source_uri, doi_state_export)
+        run_concurrently(
+            partial(download_files_from_s3, works_index_source_uri, works_index_export),
+            partial(download_files_from_s3, doi_state_source_uri, doi_state_export),
+        )
 
         # Run process
         sync_works(
@@ -109,8 +125,8 @@ def sync_works_cmd(
             log_level=level,
         )
     finally:
-        shutil.rmtree(works_index_export, ignore_errors=True)
-        shutil.rmtree(doi_state_export, ignore_errors=True)
+        fast_rmtree(works_index_export)
+        fast_rmtree(doi_state_export)
 
 
 def sync_dmps_cmd(
@@ -149,7 +165,7 @@ def sync_dmps_cmd(
             dois=dois,
         )
     finally:
-        shutil.rmtree(meta_dir, ignore_errors=True)
+        fast_rmtree(meta_dir)
 
 
 def enrich_dmps_cmd(
@@ -183,7 +199,7 @@ def enrich_dmps_cmd(
         enrich_dmps(index_name, client_config, institutions=institutions, dois=dois)
     finally:
         if meta_dir is not None:
-            shutil.rmtree(meta_dir, ignore_errors=True)
+            fast_rmtree(meta_dir)
 
 
 def dmp_works_search_cmd(
@@ -238,6 +254,7 @@ def dmp_works_search_cmd(
             include_named_queries_score=dmp_works_search_config.include_named_queries_score,
             max_concurrent_searches=dmp_works_search_config.max_concurrent_searches,
             max_concurrent_shard_requests=dmp_works_search_config.max_concurrent_shard_requests,
+            max_workers=dmp_works_search_config.max_workers,
             institutions=institutions,
             dois=dois,
             dmps_start_date=dmp_works_search_config.dmps_start_date,
@@ -255,7 +272,34 @@ def dmp_works_search_cmd(
         target_uri = s3_uri(bucket_name, PROCESS_DMPS_DMP_WORKS_SEARCH, run_id, f"{MATCHES_DIR}/")
         upload_files_to_s3(out_dir, target_uri, glob_pattern="*.jsonl.gz")
     finally:
-        shutil.rmtree(out_dir, ignore_errors=True)
+        fast_rmtree(out_dir)
+
+
+def download_match_files(match_uris: list[str], matches_dir: pathlib.Path) -> Generator[pathlib.Path, None, None]:
+    """Download match files from S3 in the background, yielding each once it has downloaded.
+
+    Files are downloaded in groups of MATCHES_GROUP_SIZE, each with a single s5cmd
+    process, and the next group is downloaded while the files of the current group
+    are consumed. Each file is deleted once the consumer moves on to the next.
+
+    Args:
+        match_uris: S3 URIs of the match files, in the order to yield them.
+        matches_dir: Local directory to download the files into.
+
+    Yields:
+        Local paths of the downloaded match files.
+    """
+
+    def download_group(uris: list[str]) -> list[pathlib.Path]:
+        paths = [matches_dir / uri.rsplit("/", 1)[-1] for uri in uris]
+        run_s5cmd_batch([["cp", uri, str(path)] for uri, path in zip(uris, paths, strict=True)])
+        return paths
+
+    with closing(prefetch_groups(list(to_batches(match_uris, MATCHES_GROUP_SIZE)), download_group)) as groups:
+        for paths in groups:
+            for path in paths:
+                yield path
+                path.unlink(missing_ok=True)
 
 
 def merge_related_works_cmd(
@@ -280,14 +324,17 @@ def merge_related_works_cmd(
     matches_dir = local_path(PROCESS_DMPS_DMP_WORKS_SEARCH, search_run_id, MATCHES_DIR)
     matches_dir.mkdir(parents=True, exist_ok=True)
     try:
-        # Download all JSONL files from S3
-        source_uri = s3_uri(bucket_name, PROCESS_DMPS_DMP_WORKS_SEARCH, search_run_id, MATCHES_DIR, "*.jsonl.gz")
-        download_files_from_s3(source_uri, matches_dir)
-
-        merge_related_works(
-            matches_dir,
-            mysql_config=mysql_config,
-            insert_batch_size=insert_batch_size,
-        )
+        # Stream the JSONL files from S3, so that merging starts as soon as the first file has downloaded
+        source_uri = s3_uri(bucket_name, PROCESS_DMPS_DMP_WORKS_SEARCH, search_run_id, MATCHES_DIR) + "/"
+        match_uris = [uri for uri in list_s3_objects(source_uri) if uri.endswith(".jsonl.gz")]
+
+        # Close the generator before the finally block deletes matches_dir, so that a
+        # prefetched group is not still downloading into it
+        with closing(download_match_files(match_uris, matches_dir)) as match_files:
+            merge_related_works(
+                match_files,
+                mysql_config=mysql_config,
+                insert_batch_size=insert_batch_size,
+            )
     finally:
-        shutil.rmtree(matches_dir, ignore_errors=True)
+        fast_rmtree(matches_dir)
@@ -1,27 +1,32 @@
 from collections.abc import Generator
-from contextlib import contextmanager
+from contextlib import closing, contextmanager
 from dataclasses import dataclass
+from functools import partial
 import logging
+import math
 import pathlib
-import shutil
 from typing import Any
 
 from dmpworks.batch.utils import (
     clean_s3_prefix,
-    download_file_from_s3,
     download_files_from_s3,
+    fast_rmtree,
+    list_s3_children,
     local_path,
+    prefetch_groups,
+    run_s5cmd_batch,
     s3_uri,
     upload_files_to_s3,
 )
 from dmpworks.cli_utils import DatasetSubsetAWS
 from dmpworks.dataset_subset import load_dois, load_institutions
 from dmpworks.model.common import Institution
+from dmpworks.utils import run_concurrently, to_batches
 
 log = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DownloadTaskContext:
     """Context for a download task.
 
@@ -65,10 +70,10 @@ def download_source_task(bucket_name: str, dataset: str, run_id: str) -> Generat
 
     # Cleanup files as we can't guarantee that we will end up on the same worker
     # again, and we don't want to take disk space that other tasks might use
-    shutil.rmtree(download_dir, ignore_errors=True)
+    fast_rmtree(download_dir)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DatasetSubsetAWSTaskContext:
     """Context for a dataset subset task.
 
@@ -119,24 +124,28 @@ def dataset_subset_task(
     subset_dir = local_path(f"{dataset}-subset", run_id)
     target_uri = s3_uri(bucket_name, f"{dataset}-subset", run_id) + "/"
 
-    # Download institutions
-    institutions_uri = s3_uri(bucket_name, dataset_subset.institutions_s3_path)
+    # Download institutions and DOIs with one s5cmd process, while cleaning the target
+    # prefix. The clean is kept out of the batch as s5cmd rm fails when the prefix is
+    # empty, which would fail the whole batch. Both files are loaded before the bulk
+    # download, so that a malformed file fails the task straight away.
     institutions_path = meta_dir / "institutions.json"
-    download_file_from_s3(institutions_uri, institutions_path)
+    dois_path = meta_dir / "dois.json"
+    downloads = [
+        ["cp", s3_uri(bucket_name, dataset_subset.institutions_s3_path), str(institutions_path)],
+        ["cp", s3_uri(bucket_name, dataset_subset.dois_s3_path), str(dois_path)],
+    ]
+    run_concurrently(
+        partial(run_s5cmd_batch, downloads),
+        partial(clean_s3_prefix, target_uri),
+    )
+
     institutions = load_institutions(institutions_path)
     log.info(f"institutions: {institutions}")
 
-    # Download DOIs
-    dois_uri = s3_uri(bucket_name, dataset_subset.dois_s3_path)
-    dois_path = meta_dir / "dois.json"
-    download_file_from_s3(dois_uri, dois_path)
     dois = load_dois(dois_path)
     log.info(f"dois: {dois}")
 
-    # Download files
-    clean_s3_prefix(target_uri)
-    download_uri = s3_uri(bucket_name, f"{dataset}-download", src_run_id, "*")
-    download_files_from_s3(download_uri, download_dir)
+    download_files_from_s3(s3_uri(bucket_name, f"{dataset}-download", src_run_id, "*"), download_dir)
     subset_dir.mkdir(parents=True, exist_ok=True)
 
     log.info(f"Transforming {dataset}")
@@ -149,16 +158,18 @@ def dataset_subset_task(
     )
     yield ctx
 
-    upload_files_to_s3(subset_dir, target_uri, "*")
-
     # Cleanup files as we can't guarantee that we will end up on the same worker
-    # again, and we don't want to take disk space that other tasks might use
-    shutil.rmtree(download_dir, ignore_errors=True)
-    shutil.rmtree(subset_dir, ignore_errors=True)
-    shutil.rmtree(meta_dir, ignore_errors=True)
+    # again, and we don't want to take disk space that other tasks might use.
+    # The inputs are removed while the subset uploads.
+    run_concurrently(
+        partial(upload_files_to_s3, subset_dir, target_uri, "*"),
+        partial(fast_rmtree, download_dir),
+        partial(fast_rmtree, meta_dir),
+    )
+    fast_rmtree(subset_dir)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TransformTaskContext:
     """Context for a transform task.
 
@@ -166,20 +177,29 @@ class TransformTaskContext:
         download_dir: The local directory where source files are downloaded.
         transform_dir: The local directory where transformed files are saved.
         target_uri: The S3 URI where transformed files will be uploaded.
+        source_uri: The S3 URI prefix that source files are downloaded from.
     """
 
     download_dir: pathlib.Path
     transform_dir: pathlib.Path
     target_uri: str
+    source_uri: str
 
 
 @contextmanager
 def transform_parquets_task(
-    bucket_name: str, dataset: str, run_id: str, use_subset: bool = False, source_run_id: str | None = None
+    bucket_name: str,
+    dataset: str,
+    run_id: str,
+    use_subset: bool = False,
+    source_run_id: str | None = None,
+    *,
+    download: bool = True,
 ) -> Generator[TransformTaskContext, Any, None]:
     """Context manager for transforming Parquet files.
 
-    Downloads source files (either full dataset or subset).
+    Downloads source files (either full dataset or subset), unless `download` is
+    False, in which case the caller downloads them from `source_uri` itself.
     Yields a context for transformation.
     Uploads transformed Parquet files to S3 and cleans up local files.
 
@@ -189,6 +209,7 @@ def transform_parquets_task(
         run_id: The unique identifier for this transform run.
         use_subset: Whether to use the subset of the dataset.
         source_run_id: Run ID of the download job to read from (defaults to run_id).
+        download: Whether to download the source files before yielding.
 
     Yields:
         A TransformTaskContext object.
@@ -201,8 +222,9 @@ def transform_parquets_task(
 
     clean_s3_prefix(target_uri)
 
-    download_uri = s3_uri(bucket_name, f"{dataset}-{phase}", src_run_id, "*")
-    download_files_from_s3(download_uri, download_dir)
+    source_uri = s3_uri(bucket_name, f"{dataset}-{phase}", src_run_id) + "/"
+    if download:
+        download_files_from_s3(f"{source_uri}*", download_dir)
     transform_dir.mkdir(parents=True, exist_ok=True)
 
     log.info(f"Transforming {dataset}")
@@ -210,12 +232,59 @@ def transform_parquets_task(
         download_dir=download_dir,
         transform_dir=transform_dir,
         target_uri=target_uri,
+        source_uri=source_uri,
     )
     yield ctx
 
-    upload_files_to_s3(transform_dir, target_uri, "*.parquet")
-
     # Cleanup files as we can't guarantee that we will end up on the same worker
-    # again, and we don't want to take disk space that other tasks might use
-    shutil.rmtree(download_dir, ignore_errors=True)
-    shutil.rmtree(transform_dir, ignore_errors=True)
+    # again, and we don't want to take disk space that other tasks might use.
+    # The downloaded files are removed while the transformed files upload.
+    run_concurrently(
+        partial(upload_files_to_s3, transform_dir, target_uri, "*.parquet"),
+        partial(fast_rmtree, download_dir),
+    )
+    fast_rmtree(transform_dir)
+
+
+def download_source_shards(ctx: TransformTaskContext, num_shards: int) -> Generator[pathlib.Path, None, None]:
+    """Download the source files of a transform task in shards.
+
+    Splits the prefixes and objects directly under `ctx.source_uri` into `num_shards`
+    shards, and downloads each shard with a single s5cmd process. The next shard is
+    downloaded while the caller processes the current one, so that the network and
+    CPU are both busy, and each shard is deleted once the caller moves on. Use with
+    `transform_parquets_task(..., download=False)`.
+
+    Args:
+        ctx: The transform task context.
+        num_shards: The number of shards to split the source prefixes and objects into.
+
+    Yields:
+        The local directory of each downloaded shard.
+    """
+    # Prefixes are copied recursively with a wildcard, and objects sitting directly
+    # under the source URI are copied one by one
+    prefixes, objects = list_s3_children(ctx.source_uri)
+    sources = [f"{prefix}*" for prefix in prefixes] + objects
+    if not sources:
+        log.warning(f"No source files found at {ctx.source_uri}")
+        return
+    shards = list(to_batches(sources, math.ceil(len(sources) / num_shards)))
+
+    def download_shard(shard: tuple[int, list[str]]) -> pathlib.Path:
+        index, shard_sources = shard
+        shard_dir = ctx.download_dir / f"shard_{index:05d}"
+        shard_dir.mkdir(parents=True, exist_ok=True)
+        run_s5cmd_batch(
+            [
+                ["cp", source, f"{shard_dir}/{source.removeprefix(ctx.source_uri).removesuffix('*')}"]
+                for source in shard_sources
+            ]
+        )
+        return shard_dir
+
+    with closing(prefetch_groups(list(enumerate(shards)), download_shard)) as shard_dirs:
+        for index, shard_dir in enumerate(shard_dirs):
+            log.info(f"Processing shard {index + 1} of {len(shards)}")
+            yield shard_dir
+            fast_rmtree(shard_dir)
@@ -1,15 +1,36 @@
+from collections.abc import Callable, Generator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import logging
+import os
 import pathlib
+import shlex
+import shutil
+import subprocess
+import threading
 from urllib.parse import urlparse
 
 import boto3
 from botocore.client import BaseClient
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from dmpworks.utils import run_process
 
 log = logging.getLogger(__name__)
 
+# s5cmd tuning: many workers for prefixes with many small objects and
+# multipart concurrency for single large objects.
+S5CMD_NUMWORKERS = 512
+S5CMD_CONCURRENCY = 32
+S5CMD_PART_SIZE_MB = 50
+# Error s5cmd reports when a wildcard matches no objects.
+S5CMD_NO_OBJECT_FOUND = "no object found"
+# Shared boto3 S3 client connection pool size, for callers that list concurrently.
+S3_MAX_POOL_CONNECTIONS = 64
+
+SCRATCH_ROOT_ENV_VAR = "DMPWORKS_SCRATCH_ROOT"
+
 
 def s3_uri(bucket_name: str, *parts: str) -> str:
     """Construct an S3 URI from a bucket name and path parts.
@@ -28,9 +49,14 @@ def s3_uri(bucket_name: str, *parts: str) -> str:
 def data_path() -> pathlib.Path:
     """Get the base data path.
 
+    The DMPWORKS_SCRATCH_ROOT environment variable overrides the location, e.g. to
+    place small jobs on tmpfs.
+
     Returns:
-        A Path object pointing to /data.
+        A Path object pointing to DMPWORKS_SCRATCH_ROOT if set, otherwise /data.
     """
+    if scratch_root := os.environ.get(SCRATCH_ROOT_ENV_VAR):
+        return pathlib.Path(scratch_root)
     return pathlib.Path("/") / "data"
 
 
@@ -46,18 +72,66 @@ def local_path(*parts: str) -> pathlib.Path:
     return pathlib.Path(data_path(), *parts)
 
 
+def fast_rmtree(path: pathlib.Path):
+    """Delete a directory tree, ignoring errors.
+
+    Uses `rm -rf`, which is much faster than shutil.rmtree on trees with many files,
+    falling back to shutil.rmtree when rm is not available.
+
+    Args:
+        path: The directory to delete.
+    """
+    if shutil.which("rm") is None:
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    subprocess.run(["rm", "-rf", str(path)], check=False)  # noqa: S603, S607
+
+
 def clean_s3_prefix(s3_uri: str):
     """Delete all objects at the specified S3 URI prefix.
 
+    `s5cmd rm` is run straight away, as it costs the same single list request as
+    checking for objects first when the prefix is empty.
+
     Args:
         s3_uri: The S3 URI prefix to clean.
+
+    Raises:
+        subprocess.CalledProcessError: If s5cmd fails for any reason other than there
+            being no objects to delete.
+    """
+    log.info(f"Cleaning S3 URI: {s3_uri}")
+    try:
+        run_process(["s5cmd", "rm", f"{s3_uri}*"], capture_stderr=True)
+    except subprocess.CalledProcessError as e:
+        if S5CMD_NO_OBJECT_FOUND in e.stderr:
+            log.info(f"No objects found at {s3_uri}")
+            return
+        raise
+
+
+def s5cmd_cp_args(source: str, target: str) -> list[str]:
+    """Build an s5cmd cp command that copies many files with the shared tuning settings.
+
+    Args:
+        source: The source path or URI, which may contain wildcards.
+        target: The destination path or URI.
+
+    Returns:
+        The s5cmd command and arguments.
     """
-    log.info(f"Checking and cleaning S3 URI: {s3_uri}")
-    if s3_uri_has_files(s3_uri):
-        log.info(f"Objects found at {s3_uri}, deleting...")
-        run_process(["s5cmd", "rm", f"{s3_uri}*"])
-    else:
-        log.info(f"No objects found at {s3_uri}")
+    return [
+        "s5cmd",
+        "--numworkers",
+        str(S5CMD_NUMWORKERS),
+        "cp",
+        "--concurrency",
+        str(S5CMD_CONCURRENCY),
+        "--part-size",
+        str(S5CMD_PART_SIZE_MB),
+        source,
+        target,
+    ]
 
 
 def upload_files_to_s3(local_dir: pathlib.Path, s3_uri: str, glob_pattern: str = "*"):
@@ -69,7 +143,7 @@ def upload_files_to_s3(local_dir: pathlib.Path, s3_uri: str, glob_pattern: str =
         glob_pattern: Glob pattern to match files in the local directory.
     """
     log.info(f"Uploading from {local_dir}/{glob_pattern} to {s3_uri}")
-    run_process(["s5cmd", "cp", f"{local_dir}/{glob_pattern}", s3_uri])
+    run_process(s5cmd_cp_args(f"{local_dir}/{glob_pattern}", s3_uri))
 
 
 def upload_file_to_s3(file: pathlib.Path, s3_uri: str):
@@ -91,7 +165,77 @@ def download_files_from_s3(source_uri: str, target_dir: pathlib.Path):
         target_dir: The local destination directory.
     """
     log.info(f"Downloading from {source_uri} to {target_dir}")
-    run_process(["s5cmd", "cp", source_uri, f"{target_dir}/"])
+    run_process(s5cmd_cp_args(source_uri, f"{target_dir}/"))
+
+
+def run_s5cmd_batch(commands: list[list[str]], env: Mapping[str, str] | None = None):
+    """Run several s5cmd commands in a single s5cmd process.
+
+    The commands are piped to `s5cmd run`, which executes them with its worker pool and
+    shared connections instead of starting a new s5cmd process for each command.
+
+    Args:
+        commands: The s5cmd commands to run, each without the leading `s5cmd`, e.g.
+            `["cp", "s3://bucket/key", "/data/key"]`.
+        env: Environment variables to set for the s5cmd process.
+
+    Raises:
+        subprocess.CalledProcessError: If any of the commands fail.
+    """
+    args = ["s5cmd", "--numworkers", str(S5CMD_NUMWORKERS), "run"]
+    script = "".join(f"{shlex.join(command)}\n" for command in commands)
+    log.info(f"run_s5cmd_batch command: `{shlex.join(args)}` with commands:\n{script}")
+
+    with subprocess.Popen(  # noqa: S603
+        args,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        env=env,
+        shell=False,
+    ) as proc:
+
+        def write_script():
+            with proc.stdin:
+                proc.stdin.write(script)
+
+        # Write from a thread so that a full stdout pipe can't block writing the commands
+        writer = threading.Thread(target=write_script, daemon=True)
+        writer.start()
+        for line in proc.stdout:
+            log.info(line)
+        writer.join()
+
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, args)
+
+
+def prefetch_groups[T, R](groups: list[T], download: Callable[[T], R]) -> Generator[R, None, None]:
+    """Download groups of files one after another in the background, yielding each once it has downloaded.
+
+    The next group is downloaded while the caller processes the current one, so that
+    the network and CPU are both busy. Close the generator before deleting the files
+    it downloads into, so that no download is still running.
+
+    Args:
+        groups: The groups to download, in the order to yield them.
+        download: Function that downloads a group and returns its result, e.g. the local paths.
+
+    Yields:
+        The result of downloading each group.
+    """
+    if not groups:
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_group = executor.submit(download, groups[0])
+        for index in range(len(groups)):
+            result = next_group.result()
+            if index + 1 < len(groups):
+                next_group = executor.submit(download, groups[index + 1])
+            yield result
 
 
 def download_file_from_s3(source_uri: str, target_file: pathlib.Path):
@@ -125,6 +269,22 @@ def parse_s3_uri(s3_uri: str) -> tuple[str, str]:
     return bucket, prefix
 
 
+@lru_cache(maxsize=1)
+def get_s3_client() -> BaseClient:
+    """Return a boto3 S3 client shared by the S3 helpers in this module.
+
+    Clients are thread safe, so one client with a large connection pool is reused rather
+    than creating a new client for each call.
+
+    Returns:
+        The boto3 S3 client.
+    """
+    return boto3.session.Session().client(
+        "s3",
+        config=Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS, retries={"mode": "adaptive"}),
+    )
+
+
 def s3_uri_has_files(
     s3_uri: str,
     *,
@@ -143,7 +303,7 @@ def s3_uri_has_files(
         RuntimeError: If listing objects fails.
     """
     if s3_client is None:
-        s3_client = boto3.client("s3")
+        s3_client = get_s3_client()
 
     bucket, prefix = parse_s3_uri(s3_uri)
 
@@ -157,3 +317,72 @@ def s3_uri_has_files(
         raise RuntimeError(f"Unable to list {s3_uri}") from err
 
     return "Contents" in resp
+
+
+def list_s3_children(
+    s3_uri: str,
+    *,
+    s3_client: BaseClient | None = None,
+) -> tuple[list[str], list[str]]:
+    """List the immediate child prefixes and objects of an S3 URI prefix.
+
+    Args:
+        s3_uri: The S3 URI prefix to list, ending with a slash.
+        s3_client: Optional boto3 S3 client.
+
+    Returns:
+        Sorted S3 URIs of the child prefixes, each ending with a slash, and sorted
+        S3 URIs of the objects directly under the prefix.
+
+    Raises:
+        RuntimeError: If listing objects fails.
+    """
+    if s3_client is None:
+        s3_client = get_s3_client()
+
+    bucket, prefix = parse_s3_uri(s3_uri)
+
+    prefixes = []
+    keys = []
+    try:
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter="/"):
+            prefixes.extend(common_prefix["Prefix"] for common_prefix in page.get("CommonPrefixes", []))
+            keys.extend(obj["Key"] for obj in page.get("Contents", []) if obj["Key"] != prefix)
+    except ClientError as err:
+        raise RuntimeError(f"Unable to list {s3_uri}") from err
+
+    return [f"s3://{bucket}/{child}" for child in sorted(prefixes)], [f"s3://{bucket}/{key}" for key in sorted(keys)]
+
+
+def list_s3_objects(
+    s3_uri: str,
+    *,
+    s3_client: BaseClient | None = None,
+) -> list[str]:
+    """List the objects under an S3 URI prefix.
+
+    Args:
+        s3_uri: The S3 URI prefix to list.
+        s3_client: Optional boto3 S3 client.
+
+    Returns:
+        Sorted S3 URIs of the objects.
+
+    Raises:
+        RuntimeError: If listing objects fails.
+    """
+    if s3_client is None:
+        s3_client = get_s3_client()
+
+    bucket, prefix = parse_s3_uri(s3_uri)
+
+    keys = []
+    try:
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            keys.extend(obj["Key"] for obj in page.get("Contents", []))
+    except ClientError as err:
+        raise RuntimeError(f"Unable to list {s3_uri}") from err
+
+    return [f"s3://{bucket}/{key}" for key in sorted(keys)]
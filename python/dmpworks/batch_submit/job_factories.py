@@ -18,6 +18,7 @@ Two call paths invoke these factories:
 from __future__ import annotations
 
 from functools import partial
+import re
 from typing import TYPE_CHECKING, Any, Literal
 
 if TYPE_CHECKING:
@@ -50,8 +51,24 @@ OPENSEARCH_QUEUE_MEMORY = 7_373
 OPENSEARCH_SYNC_WORKS_QUEUE_VCPUS = 4
 OPENSEARCH_SYNC_WORKS_QUEUE_MEMORY = 7_373
 
+# Valid (vcpus, memory) pairs, one per queue tier above
+QUEUE_TIERS = frozenset(
+    {
+        (SMALL_QUEUE_VCPUS, SMALL_QUEUE_MEMORY),
+        (DOWNLOAD_QUEUE_VCPUS, DOWNLOAD_QUEUE_MEMORY),
+        (TRANSFORM_QUEUE_VCPUS, TRANSFORM_QUEUE_MEMORY),
+        (SQLMESH_QUEUE_VCPUS, SQLMESH_QUEUE_MEMORY),
+        (OPENSEARCH_QUEUE_VCPUS, OPENSEARCH_QUEUE_MEMORY),
+        (OPENSEARCH_SYNC_WORKS_QUEUE_VCPUS, OPENSEARCH_SYNC_WORKS_QUEUE_MEMORY),
+    }
+)
+
 TQDM_POSITION = "-1"
 TQDM_MININTERVAL = "120"
+ENV_VAR_NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+COMMAND_VAR_PATTERN = re.compile(r"\$\{?([A-Za-z_][A-Za-z0-9_]*)\}?")
+
+TQDM_ENV_VARS = {"TQDM_POSITION": TQDM_POSITION, "TQDM_MININTERVAL": TQDM_MININTERVAL}
 
 # Default OpenSearch index names
 WORKS_INDEX_NAME = "works-index"
@@ -212,6 +229,36 @@ def build_env_list(env_vars: dict[str, Any]) -> list[dict[str, str]]:
     return result
 
 
+def validate_batch_params(*, command: str, vcpus: int, memory: int, env_vars: dict[str, Any]):
+    """Check that Batch job parameters are well-formed before any job is submitted.
+
+    Variables set to None in env_vars are optional: they are left unset and bash
+    expands them to nothing.
+
+    Args:
+        command: Shell command string with $VAR references.
+        vcpus: Number of vCPUs for the container.
+        memory: Memory in MiB for the container.
+        env_vars: Environment variables dict.
+
+    Raises:
+        ValueError: If an env var name is invalid, vcpus and memory are not one of the
+            QUEUE_TIERS, or the command references a variable that is not in env_vars.
+    """
+    if (vcpus, memory) not in QUEUE_TIERS:
+        raise ValueError(
+            f"vcpus={vcpus} memory={memory} do not match a queue tier, expected one of {sorted(QUEUE_TIERS)}"
+        )
+
+    invalid_names = [name for name in env_vars if not ENV_VAR_NAME_PATTERN.match(name)]
+    if invalid_names:
+        raise ValueError(f"Invalid environment variable names: {invalid_names}")
+
+    missing = sorted({name for name in COMMAND_VAR_PATTERN.findall(command) if name not in env_vars})
+    if missing:
+        raise ValueError(f"Command references undefined environment variables {missing}: {command}")
+
+
 def build_batch_params(
     *,
     run_name: str,
@@ -237,7 +284,11 @@ def build_batch_params(
 
     Returns:
         dict: SFN-compatible Batch params including run_name.
+
+    Raises:
+        ValueError: If the parameters fail validate_batch_params.
     """
+    validate_batch_params(command=command, vcpus=vcpus, memory=memory, env_vars=env_vars)
     return {
         "run_name": run_name,
         "JobQueue": queue(env),
@@ -313,8 +364,7 @@ def ror_download_factory(
             "BUCKET_NAME": bucket_name,
             "DOWNLOAD_URL": download_url,
             "FILE_HASH": file_hash,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
         },
     )
 
@@ -354,8 +404,7 @@ def dcc_download_factory(
             "BUCKET_NAME": bucket_name,
             "DOWNLOAD_URL": download_url,
             "FILE_HASH": file_hash,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
         },
     )
 
@@ -392,8 +441,7 @@ def openalex_works_download_factory(
             "RUN_ID": run_id,
             "BUCKET_NAME": bucket_name,
             "OPENALEX_BUCKET_NAME": openalex_bucket_name,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
         },
     )
 
@@ -433,8 +481,7 @@ def crossref_metadata_download_factory(
             "BUCKET_NAME": bucket_name,
             "FILE_NAME": file_name,
             "CROSSREF_METADATA_BUCKET_NAME": crossref_metadata_bucket_name,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
         },
     )
 
@@ -471,8 +518,7 @@ def datacite_download_factory(
             "RUN_ID": run_id,
             "BUCKET_NAME": bucket_name,
             "DATACITE_BUCKET_NAME": datacite_bucket_name,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
         },
     )
 
@@ -523,8 +569,7 @@ def dataset_subset_factory(
             "DATASET_SUBSET_ENABLE": dataset_subset_enable,
             "DATASET_SUBSET_INSTITUTIONS_S3_PATH": dataset_subset_institutions_s3_path,
             "DATASET_SUBSET_DOIS_S3_PATH": dataset_subset_dois_s3_path,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
         },
     )
 
@@ -577,8 +622,7 @@ def openalex_works_transform_factory(
             "PREV_JOB_RUN_ID": prev_job_run_id,
             "USE_SUBSET": use_subset,
             "LOG_LEVEL": log_level,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
             "OPENALEX_WORKS_TRANSFORM_BATCH_SIZE": openalex_works_transform_batch_size,
             "OPENALEX_WORKS_TRANSFORM_ROW_GROUP_SIZE": openalex_works_transform_row_group_size,
             "OPENALEX_WORKS_TRANSFORM_ROW_GROUPS_PER_FILE": openalex_works_transform_row_groups_per_file,
@@ -634,8 +678,7 @@ def crossref_metadata_transform_factory(
             "PREV_JOB_RUN_ID": prev_job_run_id,
             "USE_SUBSET": use_subset,
             "LOG_LEVEL": log_level,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
             "CROSSREF_METADATA_TRANSFORM_BATCH_SIZE": crossref_metadata_transform_batch_size,
             "CROSSREF_METADATA_TRANSFORM_ROW_GROUP_SIZE": crossref_metadata_transform_row_group_size,
             "CROSSREF_METADATA_TRANSFORM_ROW_GROUPS_PER_FILE": crossref_metadata_transform_row_groups_per_file,
@@ -690,8 +733,7 @@ def datacite_transform_factory(
             "PREV_JOB_RUN_ID": prev_job_run_id,
             "USE_SUBSET": use_subset,
             "LOG_LEVEL": log_level,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
             "DATACITE_TRANSFORM_BATCH_SIZE": datacite_transform_batch_size,
             "DATACITE_TRANSFORM_ROW_GROUP_SIZE": datacite_transform_row_group_size,
             "DATACITE_TRANSFORM_ROW_GROUPS_PER_FILE": datacite_transform_row_groups_per_file,
@@ -795,8 +837,7 @@ def process_works_sync_works_factory(
             "RUN_ID_SQLMESH": sqlmesh_run_id,
             "BUCKET_NAME": bucket_name,
             "INDEX_NAME": works_index_name,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
             **opensearch_config_vars,
         },
     )
@@ -834,8 +875,7 @@ def process_dmps_sync_dmps_factory(
         env_vars={
             "BUCKET_NAME": bucket_name,
             "INDEX_NAME": dmps_index_name,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
             **config_vars,
         },
     )
@@ -873,8 +913,7 @@ def process_dmps_enrich_dmps_factory(
         env_vars={
             "BUCKET_NAME": bucket_name,
             "INDEX_NAME": dmps_index_name,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
             **config_vars,
         },
     )
@@ -924,8 +963,7 @@ def process_dmps_dmp_works_search_factory(
             "RUN_ID": run_id,
             "DMPS_INDEX_NAME": dmps_index_name,
             "WORKS_INDEX_NAME": works_index_name,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
             **config_vars,
         },
     )
@@ -967,8 +1005,7 @@ def process_dmps_merge_related_works_factory(
             "BUCKET_NAME": bucket_name,
             "RUN_ID": run_id,
             "SEARCH_RUN_ID": search_run_id,
-            "TQDM_POSITION": TQDM_POSITION,
-            "TQDM_MININTERVAL": TQDM_MININTERVAL,
+            **TQDM_ENV_VARS,
             **config_vars,
         },
     )
@@ -5,6 +5,7 @@ import logging
 from typing import Any, TypedDict
 
 import boto3
+from botocore.config import Config
 import pendulum
 
 from dmpworks.batch_submit.job_factories import (
@@ -25,6 +26,14 @@ from dmpworks.batch_submit.job_factories import (
     standard_job_queue,  # noqa: F401
 )
 
+# Shared connection pool with keep-alive, and adaptive retries so that bursts of
+# SubmitJob calls back off rather than failing when throttled.
+BATCH_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 10},
+)
+
 
 def run_job_pipeline(
     *,
@@ -50,22 +59,25 @@ def run_job_pipeline(
         raise ValueError(msg) from e
     task_names = task_order[start_index:]
 
-    # Execute tasks
-    job_ids = []
+    # Check every task is defined, and which tasks accept dependencies, before
+    # submitting any jobs
+    accepts_depends_on = {}
     for task_name in task_names:
         if task_name not in task_definitions:
             msg = f"No function defined for task '{task_name}'"
             raise ValueError(msg)
+        accepts_depends_on[task_name] = "depends_on" in inspect.signature(task_definitions[task_name]).parameters
 
+    # Execute tasks
+    job_ids = []
+    for task_name in task_names:
         # Add any dependent jobs
-        task_func = task_definitions[task_name]
         kwargs = {}
-        sig = inspect.signature(task_func)
-        if "depends_on" in sig.parameters and len(job_ids) > 0:
+        if accepts_depends_on[task_name] and len(job_ids) > 0:
             kwargs["depends_on"] = [job_ids[-1]]
 
         # Call the task
-        job_id = task_func(**kwargs)
+        job_id = task_definitions[task_name](**kwargs)
         if job_id is not None:
             job_ids.append({"jobId": str(job_id)})
 
@@ -77,7 +89,7 @@ def get_aws_batch_client():
     Returns:
         boto3.client: The AWS Batch client.
     """
-    return boto3.client("batch")
+    return boto3.client("batch", config=BATCH_CLIENT_CONFIG)
 
 
 class EnvVarDict(TypedDict):
@@ -111,7 +123,7 @@ def format_date(date: pendulum.Date):
     Returns:
         str: The formatted date string.
     """
-    return date.format("YYYY-MM-DD")
+    return date.isoformat()
 
 
 def submit_job(
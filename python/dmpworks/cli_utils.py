@@ -29,6 +29,7 @@ from dmpworks.constants import (
     DMP_WORKS_SEARCH_MAX_CONCURRENT_SEARCHES,
     DMP_WORKS_SEARCH_MAX_CONCURRENT_SHARD_REQUESTS,
     DMP_WORKS_SEARCH_MAX_RESULTS,
+    DMP_WORKS_SEARCH_MAX_WORKERS,
     DMP_WORKS_SEARCH_PROJECT_END_BUFFER_YEARS,
     DMP_WORKS_SEARCH_QUERY_BUILDER,
     DMP_WORKS_SEARCH_RECORDS_PER_FILE,
@@ -498,10 +499,12 @@ class DataCiteTransformConfig:
     ] = DATACITE_TRANSFORM_MAX_WORKERS
 
 
-@dataclass
+@dataclass(frozen=True)
 class OpenSearchClientConfig:
     """Configuration for the OpenSearch client.
 
+    Frozen so that it can key the make_opensearch_client cache.
+
     Attributes:
         host: OpenSearch hostname or IP address.
         port: OpenSearch HTTP port.
@@ -771,6 +774,7 @@ class DMPWorksSearchConfig:
         include_named_queries_score: Whether to include scores for subqueries.
         max_concurrent_searches: Maximum number of concurrent searches.
         max_concurrent_shard_requests: Maximum number of shards searched per node per request.
+        max_workers: Number of searches (single or msearch) in flight at once.
         inner_hits_size: Maximum number of inner hits returned per matched work.
         records_per_file: Number of DMP records per output .jsonl.gz file.
         dmps_start_date: Return DMPs with project start dates on or after this date.
@@ -848,6 +852,14 @@ class DMPWorksSearchConfig:
             help="Maximum number of shards searched per node per request.",
         ),
     ] = DMP_WORKS_SEARCH_MAX_CONCURRENT_SHARD_REQUESTS
+    max_workers: Annotated[
+        int,
+        Parameter(
+            env_var="DMP_WORKS_SEARCH_MAX_WORKERS",
+            validator=validators.Number(gte=1),
+            help="Number of searches (single or msearch) in flight at once (must be >= 1). Tune to the size of the OpenSearch cluster.",
+        ),
+    ] = DMP_WORKS_SEARCH_MAX_WORKERS
     inner_hits_size: Annotated[
         int,
         Parameter(
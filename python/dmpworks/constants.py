@@ -49,6 +49,7 @@ DMP_WORKS_SEARCH_MAX_RESULTS = 100
 DMP_WORKS_SEARCH_PROJECT_END_BUFFER_YEARS = 3
 DMP_WORKS_SEARCH_MAX_CONCURRENT_SEARCHES = 125
 DMP_WORKS_SEARCH_MAX_CONCURRENT_SHARD_REQUESTS = 12
+DMP_WORKS_SEARCH_MAX_WORKERS = 4
 DMP_WORKS_SEARCH_INNER_HITS_SIZE = 50
 DMP_WORKS_SEARCH_RECORDS_PER_FILE = 1000
 
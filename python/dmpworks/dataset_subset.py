@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import json
 from typing import TYPE_CHECKING
 
-from pydantic import TypeAdapter
+from pydantic import TypeAdapter, ValidationError
 
 from dmpworks.model.common import Institution
 from dmpworks.transform.simdjson_transforms import extract_doi, extract_ror
@@ -11,6 +10,23 @@ from dmpworks.transform.simdjson_transforms import extract_doi, extract_ror
 if TYPE_CHECKING:
     import pathlib
 
+# Parses and validates JSON in one pass with pydantic-core, without building
+# intermediate Python objects with the json module
+INSTITUTIONS_ADAPTER = TypeAdapter(list[Institution])
+DOIS_ADAPTER = TypeAdapter(list[str])
+
+
+def is_json_invalid(err: ValidationError) -> bool:
+    """Whether a validation error was caused by malformed JSON rather than the data itself.
+
+    Args:
+        err: The validation error.
+
+    Returns:
+        True if the JSON could not be parsed.
+    """
+    return any(error["type"] == "json_invalid" for error in err.errors())
+
 
 def load_institutions(file_path: pathlib.Path) -> list[Institution]:
     """Load a list of institutions from a JSON file.
@@ -32,20 +48,20 @@ def load_institutions(file_path: pathlib.Path) -> list[Institution]:
         raise FileNotFoundError(f"Could not load institutions, file does not exist: {file_path}")
 
     try:
-        with file_path.open() as f:
-            json_data = json.load(f)
-            institutions_list_adapter = TypeAdapter(list[Institution])
-            institutions = institutions_list_adapter.validate_python(json_data)
-            result = []
-            for inst in institutions:
-                ror = extract_ror(inst.ror)
-                name = inst.name
-                if name is None and ror is None:
-                    continue
-                result.append(Institution(name=name, ror=ror))
-            return result
-    except json.JSONDecodeError as e:
-        raise ValueError("Invalid JSON provided") from e
+        institutions = INSTITUTIONS_ADAPTER.validate_json(file_path.read_bytes())
+    except ValidationError as e:
+        if is_json_invalid(e):
+            raise ValueError("Invalid JSON provided") from e
+        raise
+
+    result = []
+    for inst in institutions:
+        ror = extract_ror(inst.ror)
+        name = inst.name
+        if name is None and ror is None:
+            continue
+        result.append(Institution(name=name, ror=ror))
+    return result
 
 
 def load_dois(file_path: pathlib.Path) -> list[str]:
@@ -68,10 +84,10 @@ def load_dois(file_path: pathlib.Path) -> list[str]:
         raise FileNotFoundError(f"Could not load DOIs, file does not exist: {file_path}")
 
     try:
-        with file_path.open() as f:
-            json_data = json.load(f)
-            str_list_adapter = TypeAdapter(list[str])
-            raw_dois = str_list_adapter.validate_python(json_data)
-            return [doi for raw in raw_dois if (doi := extract_doi(raw)) is not None]
-    except json.JSONDecodeError as e:
-        raise ValueError("Invalid JSON provided") from e
+        raw_dois = DOIS_ADAPTER.validate_json(file_path.read_bytes())
+    except ValidationError as e:
+        if is_json_invalid(e):
+            raise ValueError("Invalid JSON provided") from e
+        raise
+
+    return [doi for raw in raw_dois if (doi := extract_doi(raw)) is not None]
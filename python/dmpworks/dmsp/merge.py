@@ -3,7 +3,7 @@ from __future__ import annotations
 import contextlib
 import logging
 import math
-import pathlib  # noqa: TC003
+import pathlib
 import time
 from typing import TYPE_CHECKING
 
@@ -21,7 +21,7 @@ from dmpworks.dmsp.related_works import json_work_to_work_version
 from dmpworks.utils import yield_objects_from_jsonl
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterable
 
     from dmpworks.cli_utils import MySQLConfig
 
@@ -101,7 +101,7 @@ def log_timing_summary(durations: dict[str, RunningStats]):
 
 
 def read_match_records(
-    matches_dir: pathlib.Path,
+    matches: pathlib.Path | Iterable[pathlib.Path],
 ) -> Generator[tuple[str, list[dict]], None, None]:
     """Yield (dmp_doi, works) tuples from gzip-compressed JSONL match files.
 
@@ -110,12 +110,14 @@ def read_match_records(
     be reused for the next line.
 
     Args:
-        matches_dir: Directory containing .jsonl.gz match data files.
+        matches: Directory containing .jsonl.gz match data files, or the match
+            files themselves, which are read in the order given.
 
     Yields:
         Tuples of (dmp_doi, works) where works is a list of publication dicts.
     """
-    for path in sorted(matches_dir.glob("*.jsonl.gz")):
+    paths = sorted(matches.glob("*.jsonl.gz")) if isinstance(matches, pathlib.Path) else matches
+    for path in paths:
         for record in yield_objects_from_jsonl(path):
             d = record.as_dict()
             record = None  # noqa: PLW2901 — release simdjson reference before next parse
@@ -123,7 +125,7 @@ def read_match_records(
 
 
 def merge_related_works(
-    matches_dir: pathlib.Path,
+    matches: pathlib.Path | Iterable[pathlib.Path],
     *,
     mysql_config: MySQLConfig,
     insert_batch_size: int = 1000,
@@ -135,7 +137,8 @@ def merge_related_works(
     Deadlocks (errno 1213) are retried with exponential backoff.
 
     Args:
-        matches_dir: Directory containing .jsonl.gz match data files.
+        matches: Directory containing .jsonl.gz match data files, or an iterable
+            of match files, which may be downloaded lazily as it is consumed.
         mysql_config: MySQL connection configuration.
         insert_batch_size: Number of rows per SQL INSERT batch.
     """
@@ -159,7 +162,7 @@ def merge_related_works(
         loader = RelatedWorksLoader(conn)
 
         t0 = time.perf_counter()
-        for dmp_doi, works in read_match_records(matches_dir):
+        for dmp_doi, works in read_match_records(matches):
             durations["read"].update(time.perf_counter() - t0)
             plan_id = plan_id_map.get(dmp_doi)
             if plan_id is None:
@@ -274,6 +274,7 @@ def dmp_works_search_cmd(
         include_named_queries_score=search_config.include_named_queries_score,
         max_concurrent_searches=search_config.max_concurrent_searches,
         max_concurrent_shard_requests=search_config.max_concurrent_shard_requests,
+        max_workers=search_config.max_workers,
         institutions=institutions,
         dois=dois,
         dmps_start_date=search_config.dmps_start_date,
@@ -1,5 +1,7 @@
-from collections import defaultdict
-from collections.abc import Callable
+from collections import defaultdict, deque
+from collections.abc import Callable, Generator
+from concurrent.futures import Future, ThreadPoolExecutor
+import functools
 import logging
 import math
 import pathlib
@@ -20,6 +22,9 @@ from dmpworks.utils import JsonlGzBatchWriter, timed
 
 log = logging.getLogger(__name__)
 
+# Keep msearch requests under the 10 MiB request payload limit of smaller OpenSearch instances
+MSEARCH_MAX_BYTES = 9 * 1024 * 1024
+
 
 @timed
 def dmp_works_search(
@@ -37,6 +42,7 @@ def dmp_works_search(
     include_named_queries_score: bool = False,
     max_concurrent_searches: int = 125,
     max_concurrent_shard_requests: int = 12,
+    max_workers: int = 4,
     institutions: list[Institution] | None = None,
     dois: list[str] | None = None,
     dmps_start_date: pendulum.Date | None = None,
@@ -62,6 +68,7 @@ def dmp_works_search(
         include_named_queries_score: Whether to include named queries scores.
         max_concurrent_searches: The maximum number of concurrent searches for msearch.
         max_concurrent_shard_requests: The maximum number of concurrent shard requests for msearch.
+        max_workers: The number of searches (single or msearch) to keep in flight at once.
         institutions: A list of institutions to filter DMPs by.
         dois: A list of DOIs to filter DMPs by.
         dmps_start_date: Return DMPs with project start dates on or after this date.
@@ -111,44 +118,11 @@ def dmp_works_search(
                 writer.write_record({"dmpDoi": dmp_doi, "works": pubs})
             pbar.update(count)
 
-        batch = []
-        for dmp in results.dmps:
-            if not parallel_search or include_named_queries_score:
-                works = search_dmp_works(
-                    client,
-                    works_index_name,
-                    dmp,
-                    query_builder,
-                    rerank_model_name=rerank_model_name,
-                    max_results=max_results,
-                    project_end_buffer_years=project_end_buffer_years,
-                    include_named_queries_score=include_named_queries_score,
-                    inner_hits_size=inner_hits_size,
-                )
-                write_works(works, 1)
-            else:
-                batch.append(dmp)
-                if len(batch) >= batch_size:
-                    works = msearch_dmp_works(
-                        client,
-                        works_index_name,
-                        batch,
-                        query_builder,
-                        rerank_model_name=rerank_model_name,
-                        max_results=max_results,
-                        project_end_buffer_years=project_end_buffer_years,
-                        max_concurrent_searches=max_concurrent_searches,
-                        max_concurrent_shard_requests=max_concurrent_shard_requests,
-                        inner_hits_size=inner_hits_size,
-                    )
-                    write_works(works, len(batch))
-                    batch = []
-
-        if parallel_search and batch:
-            works = msearch_dmp_works(
+        def search_batch(dmps: list[DMPModel]) -> list[RelatedWork]:
+            return msearch_dmp_works(
                 client,
                 works_index_name,
-                batch,
+                dmps,
                 query_builder,
                 rerank_model_name=rerank_model_name,
                 max_results=max_results,
@@ -157,7 +131,46 @@ def dmp_works_search(
                 max_concurrent_shard_requests=max_concurrent_shard_requests,
                 inner_hits_size=inner_hits_size,
             )
-            write_works(works, len(batch))
+
+        # Searches run on a small thread pool so that several are in flight while the
+        # scroll fetches the next DMPs. Results are written in submission order.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: deque[tuple[Future[list[RelatedWork]], int]] = deque()
+
+            def submit(search: Callable[[], list[RelatedWork]], count: int):
+                if len(pending) >= max_workers:
+                    future, pending_count = pending.popleft()
+                    write_works(future.result(), pending_count)
+                pending.append((executor.submit(search), count))
+
+            batch = []
+            for dmp in results.dmps:
+                if not parallel_search or include_named_queries_score:
+                    search = functools.partial(
+                        search_dmp_works,
+                        client,
+                        works_index_name,
+                        dmp,
+                        query_builder,
+                        rerank_model_name=rerank_model_name,
+                        max_results=max_results,
+                        project_end_buffer_years=project_end_buffer_years,
+                        include_named_queries_score=include_named_queries_score,
+                        inner_hits_size=inner_hits_size,
+                    )
+                    submit(search, 1)
+                else:
+                    batch.append(dmp)
+                    if len(batch) >= batch_size:
+                        submit(functools.partial(search_batch, batch), len(batch))
+                        batch = []
+
+            if parallel_search and batch:
+                submit(functools.partial(search_batch, batch), len(batch))
+
+            while pending:
+                future, count = pending.popleft()
+                write_works(future.result(), count)
 
 
 def msearch_dmp_works(
@@ -189,28 +202,28 @@ def msearch_dmp_works(
     Returns:
         list[RelatedWork]: A list of related works found.
     """
-    # Execute searches
-    body = []
+    # Build queries
+    queries = []
     for dmp in dmps:
-        # Header
-        body.append({})
-
-        # Body
         query = query_builder(dmp, max_results, project_end_buffer_years, inner_hits_size)
         if rerank_model_name is not None:
             query = build_dmp_works_search_rerank_query(dmp, query, max_results, rerank_model_name)
-        body.append(query)
-
-    responses = client.msearch(
-        body=body,
-        index=index_name,
-        max_concurrent_searches=max_concurrent_searches,
-        max_concurrent_shard_requests=max_concurrent_shard_requests,
-    )
+        queries.append(client.transport.serializer.dumps(query))
+
+    # Execute searches, splitting the batch if it is too large for one request
+    responses = []
+    for body in to_msearch_bodies(queries):
+        response = client.msearch(
+            body=body,
+            index=index_name,
+            max_concurrent_searches=max_concurrent_searches,
+            max_concurrent_shard_requests=max_concurrent_shard_requests,
+        )
+        responses.extend(response["responses"])
 
     # Collate results
     results = []
-    for i, response in enumerate(responses["responses"]):
+    for i, response in enumerate(responses):
         dmp = dmps[i]
         hits = response.get("hits", {}).get("hits", [])
         max_score = response.get("hits", {}).get("max_score")
@@ -219,6 +232,34 @@ def msearch_dmp_works(
     return results
 
 
+def to_msearch_bodies(queries: list[str], max_bytes: int = MSEARCH_MAX_BYTES) -> Generator[str, None, None]:
+    """Group serialized queries into NDJSON msearch request bodies of at most max_bytes.
+
+    A query that is larger than max_bytes on its own is sent in a body by itself.
+
+    Args:
+        queries: JSON serialized search queries.
+        max_bytes: The maximum size of a request body in bytes.
+
+    Yields:
+        str: An NDJSON msearch request body.
+    """
+    lines = []
+    size = 0
+    for query in queries:
+        line = f"{{}}\n{query}\n"
+        line_size = len(line.encode("utf-8"))
+        if lines and size + line_size > max_bytes:
+            yield "".join(lines)
+            lines = []
+            size = 0
+        lines.append(line)
+        size += line_size
+
+    if lines:
+        yield "".join(lines)
+
+
 def search_dmp_works(
     client: OpenSearch,
     index_name: str,
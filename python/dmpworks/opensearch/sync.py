@@ -1,6 +1,6 @@
 from collections import defaultdict
 from collections.abc import Callable, Iterator
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import cache
 import json
 import logging
@@ -84,6 +84,9 @@ def stream_parquet_batches(
 ) -> Iterator[pa.RecordBatch]:
     """Yield batches from a parquet file.
 
+    The next batch is read and decoded on a background thread while the caller
+    processes the current one.
+
     Args:
         source: Path to the parquet file.
         columns: List of columns to read.
@@ -92,9 +95,12 @@ def stream_parquet_batches(
     Yields:
         pa.RecordBatch: A batch of records.
     """
-    # Yield batches from a parquet file
-    with pq.ParquetFile(source) as parquet_file:
-        yield from parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+    with pq.ParquetFile(source) as parquet_file, ThreadPoolExecutor(max_workers=1) as executor:
+        batches = parquet_file.iter_batches(batch_size=batch_size, columns=columns)
+        next_batch = executor.submit(next, batches, None)
+        while (batch := next_batch.result()) is not None:
+            next_batch = executor.submit(next, batches, None)
+            yield batch
 
 
 def init_process(
@@ -213,8 +213,7 @@ def sync_dmps(
     os_client = make_opensearch_client(opensearch_config)
 
     # Create index if it doesn't exist
-    client = make_opensearch_client(opensearch_config)
-    create_index(client, index_name, DMPS_MAPPING_FILE)
+    create_index(os_client, index_name, DMPS_MAPPING_FILE)
 
     success_count = 0
     failed_count = 0
@@ -11,7 +11,7 @@ from dmpworks.opensearch.sync import delete_docs, sync_docs
 from dmpworks.opensearch.utils import (
     force_index_refresh,
     make_opensearch_client,
-    update_refresh_interval,
+    update_index_settings,
 )
 from dmpworks.utils import timed
 
@@ -36,6 +36,11 @@ COLUMNS = [
 
 WORKS_MAPPING_FILE = "works-mapping.json"
 
+# Index settings applied while syncing: no refreshes, and a larger translog so that
+# it flushes less often under sustained bulk writes. Restored once the sync finishes.
+BULK_LOAD_SETTINGS = {"refresh_interval": "-1", "translog.flush_threshold_size": "1gb"}
+DEFAULT_SETTINGS = {"refresh_interval": "180s", "translog.flush_threshold_size": None}
+
 
 def batch_to_work_actions(
     index_name: str,
@@ -62,9 +67,8 @@ def batch_to_work_actions(
         pc.strftime(batch["updated_date"], format="%Y-%m-%dT%H:%MZ"),
     )
 
-    # Create actions
-    for i in range(batch.num_rows):
-        doc = {name: batch[name][i].as_py() for name in batch.schema.names}
+    # Create actions, converting the whole batch to Python at once rather than cell by cell
+    for doc in batch.to_pylist():
         doi = doc["doi"]
         yield {
             "_op_type": "update",
@@ -104,11 +108,11 @@ def sync_works(
         client = make_opensearch_client(client_config)
         create_index(client, index_name, WORKS_MAPPING_FILE)
 
-        # Disable refresh interval
-        update_refresh_interval(
+        # Disable refresh interval and enlarge translog for bulk loading
+        update_index_settings(
             client=client,
             index=index_name,
-            refresh_interval="-1",
+            settings=BULK_LOAD_SETTINGS,
         )
 
         # Upsert new works
@@ -131,10 +135,10 @@ def sync_works(
         )
     finally:
         if client:
-            update_refresh_interval(
+            update_index_settings(
                 client=client,
                 index=index_name,
-                refresh_interval="180s",
+                settings=DEFAULT_SETTINGS,
             )
             force_index_refresh(
                 client=client,
@@ -1,3 +1,4 @@
+from functools import lru_cache
 import logging
 import pathlib
 
@@ -40,9 +41,13 @@ class DebugTransport(Transport):
             raise
 
 
+@lru_cache(maxsize=4)
 def make_opensearch_client(config: OpenSearchClientConfig) -> OpenSearch:
     """Create an OpenSearch client based on the configuration.
 
+    Cached for the four most recent configurations, so that commands run in the same
+    process reuse the client's connection pool instead of opening new TLS connections.
+
     Args:
         config: The OpenSearch client configuration.
 
@@ -99,13 +104,13 @@ def count_records(in_dir: pathlib.Path) -> int:
     return dataset.count_rows()
 
 
-def update_refresh_interval(*, client: OpenSearch, index: str, refresh_interval: str) -> None:
-    """Update the refresh interval for an OpenSearch index.
+def update_index_settings(*, client: OpenSearch, index: str, settings: dict[str, str | None]) -> None:
+    """Update dynamic index settings for an OpenSearch index.
 
     Args:
         client: The OpenSearch client.
         index: The name of the index.
-        refresh_interval: The new refresh interval.
+        settings: The index settings to update, a value of None resets a setting to its default.
 
     Raises:
         OpenSearchException: If the update fails.
@@ -113,13 +118,13 @@ def update_refresh_interval(*, client: OpenSearch, index: str, refresh_interval:
     try:
         client.indices.put_settings(
             index=index,
-            body={"index": {"refresh_interval": refresh_interval}},
+            body={"index": settings},
         )
 
-        log.info(f"Successfully updated refresh_interval for index '{index}' " f"to '{refresh_interval}'")
+        log.info(f"Successfully updated settings for index '{index}' to {settings}")
 
     except OpenSearchException:
-        log.exception(f"Failed to update refresh_interval for index '{index}' " f"to '{refresh_interval}'")
+        log.exception(f"Failed to update settings for index '{index}' to {settings}")
         raise
 
 
@@ -28,6 +28,7 @@ from dmpworks.constants import (
     DMP_WORKS_SEARCH_MAX_CONCURRENT_SEARCHES,
     DMP_WORKS_SEARCH_MAX_CONCURRENT_SHARD_REQUESTS,
     DMP_WORKS_SEARCH_MAX_RESULTS,
+    DMP_WORKS_SEARCH_MAX_WORKERS,
     DMP_WORKS_SEARCH_PROJECT_END_BUFFER_YEARS,
     DMP_WORKS_SEARCH_QUERY_BUILDER,
     DMP_WORKS_SEARCH_RECORDS_PER_FILE,
@@ -230,6 +231,7 @@ class DmpWorksSearchConfig(BaseModel):
         include_named_queries_score: Whether to include sub-query scores.
         max_concurrent_searches: Maximum concurrent OpenSearch searches.
         max_concurrent_shard_requests: Maximum shards searched per node per request.
+        max_workers: Number of searches (single or msearch) in flight at once.
         inner_hits_size: Maximum inner hits returned per matched work.
         row_group_size: Parquet row group size for output files.
         row_groups_per_file: Number of row groups per output Parquet file.
@@ -249,6 +251,7 @@ class DmpWorksSearchConfig(BaseModel):
     include_named_queries_score: bool = True
     max_concurrent_searches: int = DMP_WORKS_SEARCH_MAX_CONCURRENT_SEARCHES
     max_concurrent_shard_requests: int = DMP_WORKS_SEARCH_MAX_CONCURRENT_SHARD_REQUESTS
+    max_workers: int = DMP_WORKS_SEARCH_MAX_WORKERS
     inner_hits_size: int = DMP_WORKS_SEARCH_INNER_HITS_SIZE
     records_per_file: int = DMP_WORKS_SEARCH_RECORDS_PER_FILE
     dmps_start_date: str | None = None
@@ -538,6 +541,7 @@ class LambdaConfig(BaseModel):
             "DMP_WORKS_SEARCH_INCLUDE_NAMED_QUERIES_SCORE": s(dws.include_named_queries_score),
             "DMP_WORKS_SEARCH_MAX_CONCURRENT_SEARCHES": s(dws.max_concurrent_searches),
             "DMP_WORKS_SEARCH_MAX_CONCURRENT_SHARD_REQUESTS": s(dws.max_concurrent_shard_requests),
+            "DMP_WORKS_SEARCH_MAX_WORKERS": s(dws.max_workers),
             "DMP_WORKS_SEARCH_INNER_HITS_SIZE": s(dws.inner_hits_size),
             "DMP_WORKS_SEARCH_RECORDS_PER_FILE": s(dws.records_per_file),
             "DMP_WORKS_SEARCH_DMPS_START_DATE": dws.dmps_start_date,
@@ -333,8 +333,10 @@ def transform_datacite(
     row_group_size: int,
     row_groups_per_file: int,
     max_workers: int,
+    file_prefix: str = "datacite_",
+    batch_offset: int = 0,
     log_level: int = logging.INFO,
-):
+) -> int:
     """Transform DataCite JSONL files to Parquet format.
 
     Args:
@@ -344,11 +346,16 @@ def transform_datacite(
         row_group_size: Number of rows per row group in Parquet files.
         row_groups_per_file: Number of row groups per Parquet file.
         max_workers: Maximum number of worker processes.
+        file_prefix: Prefix for output filenames.
+        batch_offset: Index of the first output batch.
         log_level: Logging level.
+
+    Returns:
+        The number of batches that were written.
     """
     setup_multiprocessing_logging(log_level)
     files = list(in_dir.glob("**/*.jsonl.gz"))
-    process_files(
+    return process_files(
         files=files,
         output_dir=out_dir,
         batch_size=batch_size,
@@ -358,7 +365,8 @@ def transform_datacite(
         read_func=yield_objects_from_jsonl,
         transform_func=parse_datacite_record,
         max_workers=max_workers,
-        file_prefix="datacite_",
+        file_prefix=file_prefix,
+        batch_offset=batch_offset,
         tqdm_description="Transforming DataCite",
         log_level=log_level,
     )
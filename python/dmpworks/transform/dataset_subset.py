@@ -23,9 +23,19 @@ log = logging.getLogger(__name__)
 
 Dataset = Literal["crossref-metadata", "datacite", "openalex-works"]
 
+# Filter sets, sent once to each worker process by init_subset_worker rather than
+# pickled with every file that is submitted
+INSTITUTION_RORS: frozenset[str] = frozenset()
+INSTITUTION_NAMES: frozenset[str] = frozenset()
+DOIS: frozenset[str] = frozenset()
+
 
 def keep_record(
-    dataset: Dataset, institution_rors: set[str], institution_names: set[str], dois: set[str], record: simdjson.Object
+    dataset: Dataset,
+    institution_rors: frozenset[str],
+    institution_names: frozenset[str],
+    dois: frozenset[str],
+    record: simdjson.Object,
 ) -> bool:
     """Determine whether to keep a record based on filtering criteria.
 
@@ -118,21 +128,40 @@ def init_process_logs(level: int):
     logging.basicConfig(level=level, format="[%(asctime)s] [%(levelname)s] [%(processName)s] %(message)s")
 
 
+def init_subset_worker(
+    level: int,
+    institution_rors: frozenset[str],
+    institution_names: frozenset[str],
+    dois: frozenset[str],
+):
+    """Initialize logging and the filter sets for a worker process.
+
+    Args:
+        level: The logging level.
+        institution_rors: Set of institution RORs to keep.
+        institution_names: Set of institution names to keep.
+        dois: Set of DOIs to keep.
+    """
+    global INSTITUTION_RORS, INSTITUTION_NAMES, DOIS
+
+    init_process_logs(level)
+
+    INSTITUTION_RORS = institution_rors
+    INSTITUTION_NAMES = institution_names
+    DOIS = dois
+
+
 def filter_dataset(
     dataset: Dataset,
-    institution_rors: set[str],
-    institution_names: set[str],
-    dois: set[str],
     file_in: pathlib.Path,
     out_dir: pathlib,
 ):
     """Filter a dataset file and write matching records to an output file.
 
+    Uses the filter sets that init_subset_worker set for this worker process.
+
     Args:
         dataset: The dataset type.
-        institution_rors: Set of institution RORs to keep.
-        institution_names: Set of institution names to keep.
-        dois: Set of DOIs to keep.
         file_in: Path to the input file.
         out_dir: Path to the output directory.
 
@@ -155,7 +184,7 @@ def filter_dataset(
             try:
                 record = parser.parse(line)
 
-                if keep_record(dataset, institution_rors, institution_names, dois, record):
+                if keep_record(dataset, INSTITUTION_RORS, INSTITUTION_NAMES, DOIS, record):
                     f_out.write(line)
                     total_filtered += 1
             except ValueError:
@@ -197,9 +226,11 @@ def create_dataset_subset(
     file_glob = get_file_glob(dataset)
     files = list(pathlib.Path(in_dir).glob(file_glob))
     futures = []
-    institution_rors = {inst.ror for inst in institutions if inst.ror is not None}
-    institution_names = {val for inst in institutions if (val := clean_string(inst.name, lower=True)) is not None}
-    dois_set = {extract_doi(doi) for doi in dois}
+    institution_rors = frozenset(inst.ror for inst in institutions if inst.ror is not None)
+    institution_names = frozenset(
+        val for inst in institutions if (val := clean_string(inst.name, lower=True)) is not None
+    )
+    dois_set = frozenset(extract_doi(doi) for doi in dois)
 
     log.info(f"institutions: {institutions}")
     log.info(f"dois: {dois_set}")
@@ -208,12 +239,12 @@ def create_dataset_subset(
 
     try:
         with ProcessPoolExecutor(
-            max_workers=os.cpu_count(), initializer=init_process_logs, initargs=(log_level,)
+            max_workers=os.cpu_count(),
+            initializer=init_subset_worker,
+            initargs=(log_level, institution_rors, institution_names, dois_set),
         ) as executor:
             for file_in in files:
-                future = executor.submit(
-                    filter_dataset, dataset, institution_rors, institution_names, dois_set, file_in, out_dir
-                )
+                future = executor.submit(filter_dataset, dataset, file_in, out_dir)
                 futures.append(future)
 
             total_files = len(files)
@@ -372,8 +372,10 @@ def transform_openalex_works(
     row_groups_per_file: int,
     max_workers: int,
     include_xpac: bool = False,
+    file_prefix: str = "openalex_works_",
+    batch_offset: int = 0,
     log_level: int = logging.INFO,
-):
+) -> int:
     """Transform OpenAlex Works JSONL files to Parquet format.
 
     Args:
@@ -384,11 +386,16 @@ def transform_openalex_works(
         row_groups_per_file: Number of row groups per Parquet file.
         max_workers: Maximum number of worker processes.
         include_xpac: If True, include works flagged as xpac (is_xpac=true).
+        file_prefix: Prefix for output filenames.
+        batch_offset: Index of the first output batch.
         log_level: Logging level.
+
+    Returns:
+        The number of batches that were written.
     """
     setup_multiprocessing_logging(log_level)
     files = list(in_dir.glob("**/*.gz"))
-    process_files(
+    return process_files(
         files=files,
         output_dir=out_dir,
         batch_size=batch_size,
@@ -398,7 +405,8 @@ def transform_openalex_works(
         read_func=yield_objects_from_jsonl,
         transform_func=functools.partial(parse_openalex_works_record, include_xpac=include_xpac),
         max_workers=max_workers,
-        file_prefix="openalex_works_",
+        file_prefix=file_prefix,
+        batch_offset=batch_offset,
         tqdm_description="Transforming OpenAlex Works",
         log_level=log_level,
     )
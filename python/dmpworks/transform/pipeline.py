@@ -1,6 +1,8 @@
 from collections.abc import Callable, Generator
 from concurrent.futures import ProcessPoolExecutor
+import functools
 import logging
+import math
 import multiprocessing as mp
 from multiprocessing import synchronize
 from multiprocessing.sharedctypes import Synchronized
@@ -21,6 +23,8 @@ log = logging.getLogger(__name__)
 SHARED_FILES_PROCESSED: Synchronized | None = None
 SHARED_COUNTER_LOCK: synchronize.Lock | None = None
 SHARED_ABORT_EVENT: synchronize.Event | None = None
+# Whether the forkserver preload list has been set in this process
+FORKSERVER_PRELOAD_SET = False
 
 
 def init_process_logs(shared_files_processed: mp.Value, shared_lock: mp.Lock, abort_event: mp.Event, level: int):
@@ -34,6 +38,45 @@ def init_process_logs(shared_files_processed: mp.Value, shared_lock: mp.Lock, ab
     SHARED_ABORT_EVENT = abort_event
 
 
+def forkserver_preload_modules(*funcs: Callable) -> list[str]:
+    """List the modules for the forkserver to import before forking workers.
+
+    Args:
+        *funcs: The functions the workers call, which may be wrapped in functools.partial.
+
+    Returns:
+        The Parquet and JSON modules plus the modules that define each function.
+    """
+    modules = ["pyarrow", "pyarrow.parquet", "simdjson"]
+    for func in funcs:
+        # Unwrap partials, whose __module__ is functools rather than the wrapped function's
+        unwrapped = func
+        while isinstance(unwrapped, functools.partial):
+            unwrapped = unwrapped.func
+        if unwrapped.__module__ not in modules:
+            modules.append(unwrapped.__module__)
+    return modules
+
+
+def set_forkserver_preload_once(ctx: mp.context.BaseContext, *funcs: Callable):
+    """Set the forkserver preload modules, unless they have already been set in this process.
+
+    The preload list only takes effect when the forkserver starts, and the forkserver is
+    shared by every later pool in the process, so later transforms keep the modules of
+    the first and their workers import any others on first use.
+
+    Args:
+        ctx: The forkserver multiprocessing context.
+        *funcs: The functions the workers call, which may be wrapped in functools.partial.
+    """
+    global FORKSERVER_PRELOAD_SET
+
+    if FORKSERVER_PRELOAD_SET:
+        return
+    ctx.set_forkserver_preload(forkserver_preload_modules(*funcs))
+    FORKSERVER_PRELOAD_SET = True
+
+
 def process_files(
     *,
     files: list[pathlib.Path],
@@ -47,8 +90,9 @@ def process_files(
     tqdm_description: str = "Transforming Files",
     max_workers: int = os.cpu_count(),
     file_prefix: str | None = None,
+    batch_offset: int = 0,
     log_level: int = logging.INFO,
-):
+) -> int:
     """Transform JSON-based input files (e.g. gzipped JSON Lines) into Parquet.
 
     Streams rows from one or more JSON inputs, applies a transformation
@@ -78,12 +122,21 @@ def process_files(
         tqdm_description: Description for the progress bar.
         max_workers: Maximum number of worker processes.
         file_prefix: Optional prefix for output filenames.
+        batch_offset: Index of the first batch, so that repeated calls writing to the
+            same `output_dir` produce distinct filenames.
         log_level: Logging level.
+
+    Returns:
+        The number of batches that were processed.
     """
     log.debug("running process files")
 
     total_files = len(files)
-    ctx = mp.get_context("spawn")
+    # Workers are forked from a forkserver that has already imported the transform
+    # modules of the first transform in this process, rather than each spawned worker
+    # importing them from scratch.
+    ctx = mp.get_context("forkserver")
+    set_forkserver_preload_once(ctx, read_func, transform_func)
     shared_files_processed = ctx.Value("i", 0)
     shared_lock = ctx.Lock()
     last_seen_processed_count = 0
@@ -118,7 +171,7 @@ def process_files(
         ) as executor,
     ):
         futures = []
-        for idx, batch in enumerate(to_batches(shuffled_files, batch_size=batch_size)):
+        for idx, batch in enumerate(to_batches(shuffled_files, batch_size=batch_size), start=batch_offset):
             future = executor.submit(
                 transform_json_to_parquet,
                 batch_index=idx,
@@ -159,6 +212,7 @@ def process_files(
             time.sleep(1)
 
     log.debug("finished process files")
+    return math.ceil(total_files / batch_size)
 
 
 def transform_json_to_parquet(
@@ -2,7 +2,7 @@ from contextlib import contextmanager
 import logging
 import pathlib
 import tempfile
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import MagicMock, patch
 
 from dmpworks.batch import crossref_metadata as crossref_metadata_module
 from dmpworks.batch.tasks import DownloadTaskContext
@@ -24,8 +24,8 @@ class TestCrossrefMetadata:
             monkeypatch.delenv(var, raising=False)
 
     @pytest.fixture
-    def mock_run_process(self, mocker):
-        return mocker.patch(f"{MODULE}.run_process")
+    def mock_run_piped_process(self, mocker):
+        return mocker.patch(f"{MODULE}.run_piped_process")
 
     @pytest.fixture
     def mock_download_source_task(self):
@@ -46,7 +46,7 @@ class TestCrossrefMetadata:
         with patch(f"{MODULE}.download_source_task", mock_wrapper):
             yield {"data": data, "mock": mock_wrapper}
 
-    def test_download(self, mock_download_source_task, mock_run_process):
+    def test_download(self, mock_download_source_task, mock_run_piped_process):
         bucket = "my-bucket"
         dataset = "crossref-metadata"
         run_id = "20250101T060000-a1b2c3d4"
@@ -65,34 +65,36 @@ class TestCrossrefMetadata:
 
         temp_path = mock_download_source_task["data"]["temp_path"]
         download_dir = temp_path / dataset / run_id / "download"
-        archive_path: pathlib.Path = download_dir / archive_name
 
-        mock_run_process.assert_has_calls(
+        mock_run_piped_process.assert_called_once_with(
             [
-                call(
-                    [
-                        "s5cmd",
-                        "--request-payer",
-                        "requester",
-                        "cp",
-                        f"s3://{crossref_bucket}/{archive_name}",
-                        f"{download_dir}/",
-                    ],
-                ),
-                call(
-                    [
-                        "tar",
-                        "-xvf",
-                        str(archive_path),
-                        "-C",
-                        str(download_dir),
-                        "--strip-components",
-                        "1",
-                    ],
-                ),
-            ]
+                "s5cmd",
+                "--request-payer",
+                "requester",
+                "cat",
+                "--concurrency",
+                "32",
+                "--part-size",
+                "50",
+                f"s3://{crossref_bucket}/{archive_name}",
+            ],
+            [
+                "tar",
+                "-xf",
+                "-",
+                "-C",
+                str(download_dir),
+                "--strip-components",
+                "1",
+                "--blocking-factor=1024",
+            ],
         )
 
+    def test_tar_extract_args_gzip(self, tmp_path):
+        args = crossref_metadata_module.tar_extract_args("snapshot.tar.gz", tmp_path)
+        assert args[-1] == "--use-compress-program=pigz"
+        assert "-v" not in args
+
     @pytest.fixture
     def mock_dataset_subset_task(self):
         data = {}
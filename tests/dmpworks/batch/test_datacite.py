@@ -0,0 +1,150 @@
+from contextlib import contextmanager
+import fnmatch
+import math
+import pathlib
+import re
+import tempfile
+from unittest.mock import MagicMock, call, patch
+
+from dmpworks.batch import datacite as datacite_module
+from dmpworks.batch.tasks import DownloadTaskContext, TransformTaskContext
+from dmpworks.cli_utils import DataCiteTransformConfig
+from dmpworks.utils import output_file_name
+import pytest
+
+MODULE = "dmpworks.batch.datacite"
+
+
+class TestDataCite:
+    @pytest.fixture
+    def mock_download_source_task(self):
+        data = {}
+
+        @contextmanager
+        def mocked(bucket_name: str, dataset: str, run_id: str):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                data["download_dir"] = pathlib.Path(tmp_dir) / dataset / run_id / "download"
+                yield DownloadTaskContext(
+                    download_dir=data["download_dir"],
+                    target_uri=f"s3://{bucket_name}/{dataset}/{run_id}/download/",
+                )
+
+        with patch(f"{MODULE}.download_source_task", MagicMock(side_effect=mocked)):
+            yield data
+
+    @pytest.fixture(autouse=True)
+    def mock_credentials(self, mocker):
+        mocker.patch(f"{MODULE}.boto3")
+        return mocker.patch(
+            f"{MODULE}.fetch_datacite_aws_credentials",
+            return_value=("key-id", "secret", "token"),
+        )
+
+    def test_download_minimal_env(self, mocker, monkeypatch, mock_download_source_task):
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "batch-key-id")
+        monkeypatch.setenv("AWS_CONTAINER_CREDENTIALS_RELATIVE_URI", "/v2/credentials")
+        monkeypatch.setenv("PATH", "/usr/bin")
+        mocker.patch(f"{MODULE}.list_s3_children", return_value=(["s3://datacite/dois/updated_2024-01/"], []))
+        mock_run_process = mocker.patch(f"{MODULE}.run_process")
+
+        datacite_module.download(bucket_name="my-bucket", run_id="run", datacite_bucket_name="datacite")
+
+        env = mock_run_process.call_args.kwargs["env"]
+        assert env["PATH"] == "/usr/bin"
+        assert env["AWS_ACCESS_KEY_ID"] == "key-id"
+        assert "AWS_CONTAINER_CREDENTIALS_RELATIVE_URI" not in env
+
+    def test_download_per_prefix(self, mocker, mock_download_source_task):
+        mocker.patch(
+            f"{MODULE}.list_s3_children",
+            return_value=(["s3://datacite/dois/updated_2024-01/", "s3://datacite/dois/updated_2024-02/"], []),
+        )
+        mock_run_process = mocker.patch(f"{MODULE}.run_process")
+
+        datacite_module.download(bucket_name="my-bucket", run_id="run", datacite_bucket_name="datacite")
+
+        download_dir = mock_download_source_task["download_dir"]
+        env = mock_run_process.call_args.kwargs["env"]
+        assert env["AWS_SESSION_TOKEN"] == "token"
+        mock_run_process.assert_has_calls(
+            [
+                call(
+                    ["s5cmd", "--numworkers", "32", "cp", f"s3://datacite/dois/{month}/*", f"{download_dir}/{month}/"],
+                    env=env,
+                )
+                for month in ("updated_2024-01", "updated_2024-02")
+            ],
+            any_order=True,
+        )
+
+    def test_download_root_objects(self, mocker, mock_download_source_task):
+        mocker.patch(
+            f"{MODULE}.list_s3_children",
+            return_value=(
+                ["s3://datacite/dois/updated_2024-01/"],
+                ["s3://datacite/dois/MANIFEST", "s3://datacite/dois/part_0.jsonl.gz"],
+            ),
+        )
+        mock_run_process = mocker.patch(f"{MODULE}.run_process")
+        mock_batch = mocker.patch(f"{MODULE}.run_s5cmd_batch")
+
+        datacite_module.download(bucket_name="my-bucket", run_id="run", datacite_bucket_name="datacite")
+
+        download_dir = mock_download_source_task["download_dir"]
+        mock_run_process.assert_called_once()
+        mock_batch.assert_called_once_with(
+            [
+                ["cp", "s3://datacite/dois/MANIFEST", f"{download_dir}/MANIFEST"],
+                ["cp", "s3://datacite/dois/part_0.jsonl.gz", f"{download_dir}/part_0.jsonl.gz"],
+            ],
+            env=mock_run_process.call_args.kwargs["env"],
+        )
+
+    def test_download_empty_release(self, mocker, mock_download_source_task):
+        mocker.patch(f"{MODULE}.list_s3_children", return_value=([], []))
+        mock_run_process = mocker.patch(f"{MODULE}.run_process")
+
+        with pytest.raises(RuntimeError, match="No DataCite files"):
+            datacite_module.download(bucket_name="my-bucket", run_id="run", datacite_bucket_name="datacite")
+        mock_run_process.assert_not_called()
+
+    def test_transform_output_names_match_sqlmesh_model(self, mocker, tmp_path):
+        # Each shard writes through the real transform_datacite, with process_files
+        # replaced by one that names its outputs the way ParquetBatchWriter does
+        def fake_process_files(*, files, output_dir, batch_size, file_prefix, batch_offset, **kwargs):
+            num_batches = math.ceil(len(files) / batch_size)
+            for batch_index in range(batch_offset, batch_offset + num_batches):
+                (output_dir / output_file_name(batch_index, 0, file_prefix)).touch()
+            return num_batches
+
+        shard_dirs = []
+        for index in range(3):
+            shard_dir = tmp_path / "download" / f"shard_{index:05d}"
+            shard_dir.mkdir(parents=True)
+            for part in range(3):
+                (shard_dir / f"part_{part}.jsonl.gz").touch()
+            shard_dirs.append(shard_dir)
+        transform_dir = tmp_path / "transform"
+        transform_dir.mkdir()
+        ctx = TransformTaskContext(
+            download_dir=tmp_path / "download",
+            transform_dir=transform_dir,
+            target_uri="s3://my-bucket/datacite/run/transform/",
+            source_uri="s3://my-bucket/datacite/run/download/",
+        )
+        transform_task = mocker.patch(f"{MODULE}.transform_parquets_task")
+        transform_task.return_value.__enter__.return_value = ctx
+        mocker.patch(f"{MODULE}.download_source_shards", return_value=iter(shard_dirs))
+        mocker.patch("dmpworks.transform.datacite.process_files", side_effect=fake_process_files)
+
+        datacite_module.transform(
+            bucket_name="my-bucket",
+            run_id="run",
+            config=DataCiteTransformConfig(batch_size=2, row_group_size=100, row_groups_per_file=2, max_workers=1),
+        )
+
+        model = pathlib.Path(datacite_module.__file__).parent.parent / "sql" / "models" / "datacite" / "datacite.sql"
+        pattern = re.search(r"'/(datacite_[^']+\.parquet)'", model.read_text()).group(1)
+        names = sorted(path.name for path in transform_dir.iterdir())
+        assert len(names) == 6
+        assert all(fnmatch.fnmatchcase(name, pattern) for name in names)
@@ -1,6 +1,8 @@
 import json
 
 from dmpworks.dataset_subset import load_dois, load_institutions
+from pydantic import ValidationError
+import pytest
 
 
 def test_load_institutions(tmp_path):
@@ -32,3 +34,21 @@ def test_load_dois(tmp_path):
 
     result = load_dois(f)
     assert result == ["10.1234/example.1", "10.5678/example.2"]
+
+
+def test_load_dois_invalid_json(tmp_path):
+    """Test that malformed JSON raises a ValueError."""
+    f = tmp_path / "dois.json"
+    f.write_text('["10.1234/example.1",')
+
+    with pytest.raises(ValueError, match="Invalid JSON provided"):
+        load_dois(f)
+
+
+def test_load_institutions_invalid_data(tmp_path):
+    """Test that well formed JSON of the wrong shape raises a ValidationError."""
+    f = tmp_path / "institutions.json"
+    f.write_text(json.dumps({"name": "University of Science"}))
+
+    with pytest.raises(ValidationError):
+        load_institutions(f)
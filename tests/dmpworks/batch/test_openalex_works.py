@@ -0,0 +1,60 @@
+import fnmatch
+import math
+import pathlib
+import re
+
+from dmpworks.batch import openalex_works as openalex_works_module
+from dmpworks.batch.tasks import TransformTaskContext
+from dmpworks.cli_utils import OpenAlexWorksTransformConfig
+from dmpworks.utils import output_file_name
+
+MODULE = "dmpworks.batch.openalex_works"
+
+
+class TestOpenAlexWorks:
+    def test_transform_output_names_match_sqlmesh_model(self, mocker, tmp_path):
+        # Each shard writes through the real transform_openalex_works, with process_files
+        # replaced by one that names its outputs the way ParquetBatchWriter does
+        def fake_process_files(*, files, output_dir, batch_size, file_prefix, batch_offset, **kwargs):
+            num_batches = math.ceil(len(files) / batch_size)
+            for batch_index in range(batch_offset, batch_offset + num_batches):
+                (output_dir / output_file_name(batch_index, 0, file_prefix)).touch()
+            return num_batches
+
+        shard_dirs = []
+        for index in range(3):
+            shard_dir = tmp_path / "download" / f"shard_{index:05d}" / "updated_date=2024-01-01"
+            shard_dir.mkdir(parents=True)
+            for part in range(3):
+                (shard_dir / f"part_{part:03d}.gz").touch()
+            shard_dirs.append(shard_dir.parent)
+        transform_dir = tmp_path / "transform"
+        transform_dir.mkdir()
+        ctx = TransformTaskContext(
+            download_dir=tmp_path / "download",
+            transform_dir=transform_dir,
+            target_uri="s3://my-bucket/openalex-works/run/transform/",
+            source_uri="s3://my-bucket/openalex-works/run/download/",
+        )
+        transform_task = mocker.patch(f"{MODULE}.transform_parquets_task")
+        transform_task.return_value.__enter__.return_value = ctx
+        mocker.patch(f"{MODULE}.download_source_shards", return_value=iter(shard_dirs))
+        mocker.patch("dmpworks.transform.openalex_works.process_files", side_effect=fake_process_files)
+
+        openalex_works_module.transform(
+            bucket_name="my-bucket",
+            run_id="run",
+            config=OpenAlexWorksTransformConfig(batch_size=2, row_group_size=100, row_groups_per_file=2, max_workers=1),
+        )
+
+        model = (
+            pathlib.Path(openalex_works_module.__file__).parent.parent
+            / "sql"
+            / "models"
+            / "openalex"
+            / "openalex_works.sql"
+        )
+        pattern = re.search(r"'/(openalex_works_[^']+\.parquet)'", model.read_text()).group(1)
+        names = sorted(path.name for path in transform_dir.iterdir())
+        assert len(names) == 6
+        assert all(fnmatch.fnmatchcase(name, pattern) for name in names)
@@ -0,0 +1,86 @@
+import pathlib
+
+from dmpworks.batch.opensearch import download_match_files, load_dmp_subset_from_s3, merge_related_works_cmd
+from dmpworks.cli_utils import DMPSubsetAWS
+import pytest
+
+
+def fake_batch(commands):
+    for _, source_uri, target_file in commands:
+        pathlib.Path(target_file).write_text(source_uri)
+
+
+class TestDownloadMatchFiles:
+    def test_yields_files_in_order_and_deletes_them(self, tmp_path, mocker):
+        mocker.patch("dmpworks.batch.opensearch.MATCHES_GROUP_SIZE", 4)
+        mock_batch = mocker.patch("dmpworks.batch.opensearch.run_s5cmd_batch", side_effect=fake_batch)
+        uris = [f"s3://bucket/matches/matches_{i:04d}.jsonl.gz" for i in range(6)]
+
+        seen = []
+        for path in download_match_files(uris, tmp_path):
+            seen.append(path.read_text())
+            previous = path
+
+        assert seen == uris
+        assert not previous.exists()
+        assert [len(call.args[0]) for call in mock_batch.call_args_list] == [4, 2]
+        assert mock_batch.call_args_list[0].args[0][0] == ["cp", uris[0], str(tmp_path / "matches_0000.jsonl.gz")]
+
+    def test_no_files(self, tmp_path, mocker):
+        mock_batch = mocker.patch("dmpworks.batch.opensearch.run_s5cmd_batch")
+
+        assert list(download_match_files([], tmp_path)) == []
+        mock_batch.assert_not_called()
+
+
+class TestMergeRelatedWorksCmd:
+    def test_downloads_finish_before_cleanup_on_error(self, tmp_path, mocker):
+        mocker.patch("dmpworks.batch.opensearch.local_path", side_effect=lambda *parts: tmp_path.joinpath(*parts))
+        mocker.patch("dmpworks.batch.opensearch.MATCHES_GROUP_SIZE", 1)
+        uris = [f"s3://bucket/matches/matches_{i:04d}.jsonl.gz" for i in range(3)]
+        mocker.patch("dmpworks.batch.opensearch.list_s3_objects", return_value=uris)
+        events = []
+
+        def record_batch(commands):
+            fake_batch(commands)
+            events.append("downloaded")
+
+        def fail_merge(match_files, **kwargs):
+            next(match_files)
+            raise RuntimeError("merge failed")
+
+        mocker.patch("dmpworks.batch.opensearch.run_s5cmd_batch", side_effect=record_batch)
+        mocker.patch("dmpworks.batch.opensearch.fast_rmtree", side_effect=lambda path: events.append("removed"))
+        mocker.patch("dmpworks.dmsp.merge.merge_related_works", side_effect=fail_merge)
+
+        with pytest.raises(RuntimeError, match="merge failed"):
+            merge_related_works_cmd(
+                bucket_name="bucket", run_id="run", search_run_id="search", mysql_config=mocker.MagicMock()
+            )
+
+        assert events == ["downloaded", "downloaded", "removed"]
+
+
+class TestLoadDmpSubsetFromS3:
+    def test_downloads_institutions_and_dois(self, tmp_path, mocker):
+        mock_download = mocker.patch("dmpworks.batch.opensearch.download_file_from_s3")
+        mocker.patch("dmpworks.batch.opensearch.load_institutions", return_value=["inst"])
+        mocker.patch("dmpworks.batch.opensearch.load_dois", return_value=["10.0000/a"])
+        dmp_subset = DMPSubsetAWS(
+            enable=True, institutions_s3_path="meta/institutions.json", dois_s3_path="meta/dois.json"
+        )
+
+        institutions, dois = load_dmp_subset_from_s3("my-bucket", dmp_subset, tmp_path)
+
+        assert institutions == ["inst"]
+        assert dois == ["10.0000/a"]
+        assert sorted(call.args for call in mock_download.call_args_list) == [
+            ("s3://my-bucket/meta/dois.json", tmp_path / "dois.json"),
+            ("s3://my-bucket/meta/institutions.json", tmp_path / "institutions.json"),
+        ]
+
+    def test_subset_disabled(self, tmp_path, mocker):
+        mock_download = mocker.patch("dmpworks.batch.opensearch.download_file_from_s3")
+
+        assert load_dmp_subset_from_s3("my-bucket", None, tmp_path) == (None, None)
+        mock_download.assert_not_called()
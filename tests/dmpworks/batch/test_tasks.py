@@ -0,0 +1,132 @@
+from dmpworks.batch.tasks import (
+    TransformTaskContext,
+    dataset_subset_task,
+    download_source_shards,
+    transform_parquets_task,
+)
+from dmpworks.cli_utils import DatasetSubsetAWS
+import pytest
+
+MODULE = "dmpworks.batch.tasks"
+
+
+class TestDatasetSubsetTask:
+    def test_downloads_inputs_and_uploads_subset(self, tmp_path, mocker):
+        mocker.patch(f"{MODULE}.local_path", side_effect=lambda *parts: tmp_path.joinpath(*parts))
+        mock_batch = mocker.patch(f"{MODULE}.run_s5cmd_batch")
+        mock_clean = mocker.patch(f"{MODULE}.clean_s3_prefix")
+        mock_download = mocker.patch(f"{MODULE}.download_files_from_s3")
+        mock_upload = mocker.patch(f"{MODULE}.upload_files_to_s3")
+        mocker.patch(f"{MODULE}.load_institutions", return_value=["inst"])
+        mocker.patch(f"{MODULE}.load_dois", return_value=["10.0000/a"])
+        config = DatasetSubsetAWS(enable=True, institutions_s3_path="meta/inst.json", dois_s3_path="meta/dois.json")
+
+        with dataset_subset_task(bucket_name="bucket", dataset="datacite", run_id="run", dataset_subset=config) as ctx:
+            assert ctx.institutions == ["inst"]
+            assert ctx.dois == ["10.0000/a"]
+            assert ctx.subset_dir.is_dir()
+
+        meta_dir = tmp_path / "datacite-meta" / "run"
+        mock_batch.assert_called_once_with(
+            [
+                ["cp", "s3://bucket/meta/inst.json", str(meta_dir / "institutions.json")],
+                ["cp", "s3://bucket/meta/dois.json", str(meta_dir / "dois.json")],
+            ]
+        )
+        mock_download.assert_called_once_with("s3://bucket/datacite-download/run/*", ctx.download_dir)
+        mock_clean.assert_called_once_with("s3://bucket/datacite-subset/run/")
+        mock_upload.assert_called_once_with(ctx.subset_dir, "s3://bucket/datacite-subset/run/", "*")
+
+    def test_invalid_meta_file_fails_before_bulk_download(self, tmp_path, mocker):
+        mocker.patch(f"{MODULE}.local_path", side_effect=lambda *parts: tmp_path.joinpath(*parts))
+        mocker.patch(f"{MODULE}.run_s5cmd_batch")
+        mocker.patch(f"{MODULE}.clean_s3_prefix")
+        mock_download = mocker.patch(f"{MODULE}.download_files_from_s3")
+        mocker.patch(f"{MODULE}.load_institutions", side_effect=ValueError("invalid institutions"))
+        config = DatasetSubsetAWS(enable=True, institutions_s3_path="meta/inst.json", dois_s3_path="meta/dois.json")
+
+        with (
+            pytest.raises(ValueError, match="invalid institutions"),
+            dataset_subset_task(bucket_name="bucket", dataset="datacite", run_id="run", dataset_subset=config),
+        ):
+            pass
+
+        mock_download.assert_not_called()
+
+
+class TestTransformParquetsTask:
+    def test_uploads_transformed_files_and_removes_local_files(self, tmp_path, mocker):
+        mocker.patch(f"{MODULE}.local_path", side_effect=lambda *parts: tmp_path.joinpath(*parts))
+        mocker.patch(f"{MODULE}.clean_s3_prefix")
+        mocker.patch(
+            f"{MODULE}.download_files_from_s3", side_effect=lambda uri, local_dir: local_dir.mkdir(parents=True)
+        )
+        mock_upload = mocker.patch(f"{MODULE}.upload_files_to_s3")
+
+        with transform_parquets_task("bucket", "datacite", "run") as ctx:
+            assert ctx.download_dir.is_dir()
+            assert ctx.transform_dir.is_dir()
+
+        mock_upload.assert_called_once_with(ctx.transform_dir, "s3://bucket/datacite-transform/run/", "*.parquet")
+        assert not ctx.download_dir.exists()
+        assert not ctx.transform_dir.exists()
+
+
+class TestDownloadSourceShards:
+    @staticmethod
+    def make_ctx(tmp_path):
+        return TransformTaskContext(
+            download_dir=tmp_path / "download",
+            transform_dir=tmp_path / "transform",
+            target_uri="s3://bucket/datacite-transform/run/",
+            source_uri="s3://bucket/datacite-download/run/",
+        )
+
+    def test_yields_each_shard_and_removes_it(self, tmp_path, mocker):
+        root = "s3://bucket/datacite-download/run/"
+        prefixes = [f"{root}dir_{i}/" for i in range(3)]
+        objects = [f"{root}manifest"]
+        mocker.patch(f"{MODULE}.list_s3_children", return_value=(prefixes, objects))
+        mock_batch = mocker.patch(f"{MODULE}.run_s5cmd_batch")
+        ctx = self.make_ctx(tmp_path)
+
+        shard_dirs = []
+        for shard_dir in download_source_shards(ctx, 2):
+            assert shard_dir.is_dir()
+            shard_dirs.append(shard_dir)
+
+        assert shard_dirs == [ctx.download_dir / "shard_00000", ctx.download_dir / "shard_00001"]
+        assert not any(shard_dir.exists() for shard_dir in shard_dirs)
+        assert [call.args[0] for call in mock_batch.call_args_list] == [
+            [
+                ["cp", f"{root}dir_0/*", f"{shard_dirs[0]}/dir_0/"],
+                ["cp", f"{root}dir_1/*", f"{shard_dirs[0]}/dir_1/"],
+            ],
+            [
+                ["cp", f"{root}dir_2/*", f"{shard_dirs[1]}/dir_2/"],
+                ["cp", f"{root}manifest", f"{shard_dirs[1]}/manifest"],
+            ],
+        ]
+
+    def test_downloads_objects_without_prefixes(self, tmp_path, mocker):
+        root = "s3://bucket/datacite-download/run/"
+        objects = [f"{root}part_001.jsonl.gz", f"{root}part_002.jsonl.gz"]
+        mocker.patch(f"{MODULE}.list_s3_children", return_value=([], objects))
+        mock_batch = mocker.patch(f"{MODULE}.run_s5cmd_batch")
+        ctx = self.make_ctx(tmp_path)
+
+        shard_dir = ctx.download_dir / "shard_00000"
+        assert list(download_source_shards(ctx, 1)) == [shard_dir]
+        mock_batch.assert_called_once_with(
+            [
+                ["cp", objects[0], f"{shard_dir}/part_001.jsonl.gz"],
+                ["cp", objects[1], f"{shard_dir}/part_002.jsonl.gz"],
+            ]
+        )
+
+    def test_yields_nothing_for_empty_source(self, tmp_path, mocker):
+        mocker.patch(f"{MODULE}.list_s3_children", return_value=([], []))
+        mock_batch = mocker.patch(f"{MODULE}.run_s5cmd_batch")
+
+        assert list(download_source_shards(self.make_ctx(tmp_path), 8)) == []
+        mock_batch.assert_not_called()
@@ -0,0 +1,261 @@
+import pathlib
+import subprocess
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+from dmpworks.batch.utils import (
+    clean_s3_prefix,
+    data_path,
+    download_files_from_s3,
+    fast_rmtree,
+    get_s3_client,
+    list_s3_children,
+    list_s3_objects,
+    prefetch_groups,
+    run_s5cmd_batch,
+    s3_uri_has_files,
+    upload_files_to_s3,
+)
+import pytest
+
+
+class TestGetS3Client:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        get_s3_client.cache_clear()
+        yield
+        get_s3_client.cache_clear()
+
+    def test_reuses_client(self, mocker):
+        mock_session = mocker.patch("dmpworks.batch.utils.boto3.session.Session")
+
+        assert get_s3_client() is get_s3_client()
+        mock_session.return_value.client.assert_called_once()
+        config = mock_session.return_value.client.call_args.kwargs["config"]
+        assert config.max_pool_connections == 64
+        assert config.retries == {"mode": "adaptive"}
+
+    def test_default_client_used_by_s3_uri_has_files(self, mocker):
+        s3_client = MagicMock()
+        s3_client.list_objects_v2.return_value = {"Contents": [{"Key": "run/file.jsonl.gz"}]}
+        mocker.patch("dmpworks.batch.utils.get_s3_client", return_value=s3_client)
+
+        assert s3_uri_has_files("s3://my-bucket/run/")
+        s3_client.list_objects_v2.assert_called_once_with(Bucket="my-bucket", Prefix="run/", MaxKeys=1)
+
+
+class TestListS3Children:
+    def test_lists_child_prefixes(self):
+        s3_client = MagicMock()
+        s3_client.get_paginator.return_value.paginate.return_value = [
+            {"CommonPrefixes": [{"Prefix": "datacite-download/run/updated_2024-02/"}]},
+            {"CommonPrefixes": [{"Prefix": "datacite-download/run/updated_2024-01/"}]},
+        ]
+
+        prefixes, objects = list_s3_children("s3://my-bucket/datacite-download/run/", s3_client=s3_client)
+
+        s3_client.get_paginator.return_value.paginate.assert_called_once_with(
+            Bucket="my-bucket", Prefix="datacite-download/run/", Delimiter="/"
+        )
+        assert prefixes == [
+            "s3://my-bucket/datacite-download/run/updated_2024-01/",
+            "s3://my-bucket/datacite-download/run/updated_2024-02/",
+        ]
+        assert objects == []
+
+    def test_lists_prefixes_and_root_objects(self):
+        s3_client = MagicMock()
+        s3_client.get_paginator.return_value.paginate.return_value = [
+            {
+                "CommonPrefixes": [{"Prefix": "run/b/"}, {"Prefix": "run/a/"}],
+                "Contents": [{"Key": "run/"}, {"Key": "run/manifest"}],
+            },
+        ]
+
+        prefixes, objects = list_s3_children("s3://my-bucket/run/", s3_client=s3_client)
+
+        assert prefixes == ["s3://my-bucket/run/a/", "s3://my-bucket/run/b/"]
+        assert objects == ["s3://my-bucket/run/manifest"]
+
+    def test_no_child_prefixes(self):
+        s3_client = MagicMock()
+        s3_client.get_paginator.return_value.paginate.return_value = [{"Contents": [{"Key": "run/file.jsonl.gz"}]}]
+
+        assert list_s3_children("s3://my-bucket/run/", s3_client=s3_client) == (
+            [],
+            ["s3://my-bucket/run/file.jsonl.gz"],
+        )
+
+    def test_client_error(self):
+        s3_client = MagicMock()
+        s3_client.get_paginator.return_value.paginate.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "ListObjectsV2"
+        )
+
+        with pytest.raises(RuntimeError):
+            list_s3_children("s3://my-bucket/run/", s3_client=s3_client)
+
+
+class TestListS3Objects:
+    def test_lists_objects(self):
+        s3_client = MagicMock()
+        s3_client.get_paginator.return_value.paginate.return_value = [
+            {"Contents": [{"Key": "run/matches/matches_0001.jsonl.gz"}]},
+            {"Contents": [{"Key": "run/matches/matches_0000.jsonl.gz"}]},
+            {},
+        ]
+
+        uris = list_s3_objects("s3://my-bucket/run/matches/", s3_client=s3_client)
+
+        assert uris == [
+            "s3://my-bucket/run/matches/matches_0000.jsonl.gz",
+            "s3://my-bucket/run/matches/matches_0001.jsonl.gz",
+        ]
+
+    def test_client_error(self):
+        s3_client = MagicMock()
+        s3_client.get_paginator.return_value.paginate.side_effect = ClientError(
+            {"Error": {"Code": "AccessDenied"}}, "ListObjectsV2"
+        )
+
+        with pytest.raises(RuntimeError):
+            list_s3_objects("s3://my-bucket/run/", s3_client=s3_client)
+
+
+class TestDataPath:
+    def test_scratch_root_env_var(self, monkeypatch):
+        monkeypatch.setenv("DMPWORKS_SCRATCH_ROOT", "/dev/shm/dmpworks")
+        assert data_path() == pathlib.Path("/dev/shm/dmpworks")
+
+    def test_defaults_to_data(self, monkeypatch):
+        monkeypatch.delenv("DMPWORKS_SCRATCH_ROOT", raising=False)
+        assert data_path() == pathlib.Path("/data")
+
+
+class TestS5cmdCopyMany:
+    TUNING = ["--numworkers", "512", "cp", "--concurrency", "32", "--part-size", "50"]
+
+    def test_upload_files_uses_shared_tuning(self, mocker):
+        mock_run_process = mocker.patch("dmpworks.batch.utils.run_process")
+
+        upload_files_to_s3(pathlib.Path("/data/transform"), "s3://bucket/run/", "*.parquet")
+
+        mock_run_process.assert_called_once_with(
+            ["s5cmd", *self.TUNING, "/data/transform/*.parquet", "s3://bucket/run/"]
+        )
+
+    def test_download_files_uses_shared_tuning(self, mocker):
+        mock_run_process = mocker.patch("dmpworks.batch.utils.run_process")
+
+        download_files_from_s3("s3://bucket/run/*", pathlib.Path("/data/download"))
+
+        mock_run_process.assert_called_once_with(["s5cmd", *self.TUNING, "s3://bucket/run/*", "/data/download/"])
+
+
+class TestFastRmtree:
+    def test_removes_tree(self, tmp_path):
+        tree = tmp_path / "tree"
+        (tree / "nested").mkdir(parents=True)
+        (tree / "nested" / "file.txt").write_text("data")
+
+        fast_rmtree(tree)
+
+        assert not tree.exists()
+
+    def test_missing_path_is_ignored(self, tmp_path):
+        fast_rmtree(tmp_path / "missing")
+
+    def test_falls_back_without_rm(self, tmp_path, mocker):
+        mocker.patch("dmpworks.batch.utils.shutil.which", return_value=None)
+        tree = tmp_path / "tree"
+        tree.mkdir()
+
+        fast_rmtree(tree)
+
+        assert not tree.exists()
+
+
+class TestCleanS3Prefix:
+    def test_removes_objects_without_listing_first(self, mocker):
+        mock_run_process = mocker.patch("dmpworks.batch.utils.run_process")
+        mock_has_files = mocker.patch("dmpworks.batch.utils.s3_uri_has_files")
+
+        clean_s3_prefix("s3://my-bucket/run/")
+
+        mock_run_process.assert_called_once_with(["s5cmd", "rm", "s3://my-bucket/run/*"], capture_stderr=True)
+        mock_has_files.assert_not_called()
+
+    def test_ignores_no_object_found(self, mocker):
+        stderr = 'ERROR "rm s3://my-bucket/run/*": no object found\n'
+        mocker.patch(
+            "dmpworks.batch.utils.run_process",
+            side_effect=subprocess.CalledProcessError(1, [], stderr=stderr),
+        )
+
+        clean_s3_prefix("s3://my-bucket/run/")
+
+    def test_raises_other_errors(self, mocker):
+        stderr = 'ERROR "rm s3://my-bucket/run/*": AccessDenied\n'
+        mocker.patch(
+            "dmpworks.batch.utils.run_process",
+            side_effect=subprocess.CalledProcessError(1, [], stderr=stderr),
+        )
+
+        with pytest.raises(subprocess.CalledProcessError):
+            clean_s3_prefix("s3://my-bucket/run/")
+
+
+class TestPrefetchGroups:
+    def test_yields_each_group_in_order(self):
+        downloaded = []
+
+        def download(group):
+            downloaded.append(group)
+            return sum(group)
+
+        results = []
+        for result in prefetch_groups([[1, 2], [3], [4, 5]], download):
+            results.append(result)
+            # The next group has been submitted before the current one is yielded
+            assert len(downloaded) >= len(results)
+
+        assert results == [3, 3, 9]
+        assert downloaded == [[1, 2], [3], [4, 5]]
+
+    def test_empty_groups(self):
+        assert list(prefetch_groups([], lambda group: group)) == []
+
+    def test_close_waits_for_running_download(self):
+        finished = []
+
+        def download(group):
+            finished.append(group)
+            return group
+
+        groups = prefetch_groups(["a", "b", "c"], download)
+        assert next(groups) == "a"
+        groups.close()
+
+        assert finished == ["a", "b"]
+
+
+class TestRunS5cmdBatch:
+    def test_pipes_commands_to_s5cmd_run(self, tmp_path, mocker):
+        script_path = tmp_path / "script.txt"
+        fake_s5cmd = tmp_path / "s5cmd"
+        fake_s5cmd.write_text(f"#!/bin/sh\ncat > {script_path}\necho done\n")
+        fake_s5cmd.chmod(0o755)
+        mocker.patch.dict("os.environ", {"PATH": f"{tmp_path}:/usr/bin:/bin"})
+
+        run_s5cmd_batch([["rm", "s3://bucket/run/*"], ["cp", "s3://bucket/a b.json", "/data/a b.json"]])
+
+        assert script_path.read_text() == "rm 's3://bucket/run/*'\ncp 's3://bucket/a b.json' '/data/a b.json'\n"
+
+    def test_raises_on_failure(self, tmp_path, mocker):
+        fake_s5cmd = tmp_path / "s5cmd"
+        fake_s5cmd.write_text("#!/bin/sh\ncat > /dev/null\nexit 1\n")
+        fake_s5cmd.chmod(0o755)
+        mocker.patch.dict("os.environ", {"PATH": f"{tmp_path}:/usr/bin:/bin"})
+
+        with pytest.raises(subprocess.CalledProcessError):
+            run_s5cmd_batch([["cp", "s3://bucket/a.json", "/data/a.json"]])
@@ -468,8 +468,8 @@ class TestBuildBatchParams:
             env="dev",
             queue=lambda env: f"queue-{env}",
             job_definition=lambda env: f"jobdef-{env}",
-            vcpus=4,
-            memory=8192,
+            vcpus=DOWNLOAD_QUEUE_VCPUS,
+            memory=DOWNLOAD_QUEUE_MEMORY,
             command="echo hello",
             env_vars={"FOO": "bar"},
         )
@@ -478,8 +478,8 @@ class TestBuildBatchParams:
         assert result["JobDefinition"] == "jobdef-dev"
         overrides = result["ContainerOverrides"]
         assert overrides["Command"] == ["/bin/bash", "-c", "echo hello"]
-        assert overrides["Vcpus"] == 4
-        assert overrides["Memory"] == 8192
+        assert overrides["Vcpus"] == DOWNLOAD_QUEUE_VCPUS
+        assert overrides["Memory"] == DOWNLOAD_QUEUE_MEMORY
         assert overrides["Environment"] == [{"Name": "FOO", "Value": "bar"}]
 
     def test_wraps_command_in_bash(self):
@@ -488,8 +488,8 @@ class TestBuildBatchParams:
             env="dev",
             queue=lambda e: "q",
             job_definition=lambda e: "j",
-            vcpus=1,
-            memory=1,
+            vcpus=SMALL_QUEUE_VCPUS,
+            memory=SMALL_QUEUE_MEMORY,
             command="dmpworks aws-batch ror download",
             env_vars={},
         )
@@ -501,8 +501,8 @@ class TestBuildBatchParams:
             env="dev",
             queue=lambda e: "q",
             job_definition=lambda e: "j",
-            vcpus=1,
-            memory=1,
+            vcpus=SMALL_QUEUE_VCPUS,
+            memory=SMALL_QUEUE_MEMORY,
             command="cmd",
             env_vars={"PRESENT": "yes", "ABSENT": None, "FLAG": True},
         )
@@ -513,6 +513,43 @@ class TestBuildBatchParams:
         flag_val = next(e["Value"] for e in env if e["Name"] == "FLAG")
         assert flag_val == "true"
 
+    def test_accepts_optional_var_set_to_none(self):
+        result = build_batch_params(
+            run_name="x",
+            env="dev",
+            queue=lambda e: "q",
+            job_definition=lambda e: "j",
+            vcpus=SMALL_QUEUE_VCPUS,
+            memory=SMALL_QUEUE_MEMORY,
+            command="cmd $FILE_HASH",
+            env_vars={"FILE_HASH": None},
+        )
+        assert result["ContainerOverrides"]["Environment"] == []
+
+    @pytest.mark.parametrize(
+        ("command", "vcpus", "memory", "env_vars", "match"),
+        [
+            ("cmd $RUN_ID", SMALL_QUEUE_VCPUS, SMALL_QUEUE_MEMORY, {}, "RUN_ID"),
+            ("cmd ${RUN_ID}", SMALL_QUEUE_VCPUS, SMALL_QUEUE_MEMORY, {"OTHER": "x"}, "RUN_ID"),
+            ("cmd", SMALL_QUEUE_VCPUS, SMALL_QUEUE_MEMORY, {"BAD-NAME": "x"}, "BAD-NAME"),
+            ("cmd", 0, SMALL_QUEUE_MEMORY, {}, "queue tier"),
+            ("cmd", 4, 8192, {}, "queue tier"),
+            ("cmd", SMALL_QUEUE_VCPUS, SQLMESH_QUEUE_MEMORY, {}, "queue tier"),
+        ],
+    )
+    def test_rejects_invalid_params(self, command, vcpus, memory, env_vars, match):
+        with pytest.raises(ValueError, match=match):
+            build_batch_params(
+                run_name="x",
+                env="dev",
+                queue=lambda e: "q",
+                job_definition=lambda e: "j",
+                vcpus=vcpus,
+                memory=memory,
+                command=command,
+                env_vars=env_vars,
+            )
+
 
 class TestFactoryOutput:
     """Test factory output: batch params, env vars, and expanded commands (Lambda path)."""
@@ -552,6 +589,13 @@ class TestFactoryOutput:
         expanded = expand_command(params)
         assert expanded == FACTORY_EXPECTATIONS[key]["expanded_command"]
 
+    @pytest.mark.parametrize("key", [("ror", "download"), ("data-citation-corpus", "download")])
+    def test_none_file_hash_builds_params(self, key):
+        """Releases without a hash still submit, with FILE_HASH left unset."""
+        params = JOB_FACTORIES[key](**{**MINIMAL_FACTORY_ARGS[key], "file_hash": None})
+        assert "FILE_HASH" not in get_env_dict(params)
+        assert "$FILE_HASH" in params["ContainerOverrides"]["Command"][2]
+
     def test_none_prev_job_run_id_filtered_from_env(self):
         params = JOB_FACTORIES[("openalex-works", "transform")](
             **MINIMAL_FACTORY_ARGS[("openalex-works", "transform")], prev_job_run_id=None
@@ -1,5 +1,6 @@
 from unittest.mock import MagicMock
 
+import pendulum
 import pytest
 
 from dmpworks.batch_submit.job_factories import (
@@ -8,6 +9,9 @@ from dmpworks.batch_submit.job_factories import (
     standard_job_definition,
 )
 from dmpworks.batch_submit.jobs import (
+    BATCH_CLIENT_CONFIG,
+    format_date,
+    get_aws_batch_client,
     get_task_types_to_run,
     make_env,
     run_job_pipeline,
@@ -43,6 +47,21 @@ class TestNamingHelpers:
         assert standard_job_queue("stg") == "dmpworks-stg-batch-small-job-queue"
 
 
+class TestGetAwsBatchClient:
+    def test_client_is_cached_and_configured(self, mocker):
+        mock_client = mocker.patch("dmpworks.batch_submit.jobs.boto3.client")
+        get_aws_batch_client.cache_clear()
+
+        assert get_aws_batch_client() is get_aws_batch_client()
+        mock_client.assert_called_once_with("batch", config=BATCH_CLIENT_CONFIG)
+        get_aws_batch_client.cache_clear()
+
+
+class TestFormatDate:
+    def test_formats_as_iso_date(self):
+        assert format_date(pendulum.date(2025, 1, 5)) == "2025-01-05"
+
+
 class TestMakeEnv:
     def test_converts_dict_to_list_of_name_value_dicts(self):
         result = make_env({"FOO": "bar", "BAZ": "qux"})
@@ -163,6 +182,17 @@ class TestRunJobPipeline:
                 start_task_name="task1",
             )
 
+    def test_missing_task_definition_submits_nothing(self):
+        task1 = MagicMock(return_value="job-1")
+
+        with pytest.raises(ValueError, match="No function defined"):
+            run_job_pipeline(
+                task_definitions={"task1": task1},
+                task_order=["task1", "task2"],
+                start_task_name="task1",
+            )
+        task1.assert_not_called()
+
 
 class TestSubmitFactoryJob:
     def test_calls_factory_and_submits(self, mock_submit):
@@ -133,6 +133,7 @@ class TestOpenSearchCLI:
             include_named_queries_score=True,
             max_concurrent_searches=125,
             max_concurrent_shard_requests=12,
+            max_workers=4,
             institutions=None,
             dois=None,
             dmps_start_date=None,
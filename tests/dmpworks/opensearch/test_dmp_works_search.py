@@ -1,6 +1,13 @@
+from contextlib import contextmanager
 import pathlib
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
+from dmpworks.opensearch.dmp_works_search import dmp_works_search, to_msearch_bodies
 from dmpworks.utils import JsonlGzBatchWriter
+
 from tests.utils import read_jsonl_gz
 
 
@@ -58,3 +65,88 @@ class TestMatchDataJsonlRoundtrip:
         for f in jsonl_files:
             all_records.extend(read_jsonl_gz(f))
         assert len(all_records) == 3
+
+
+class TestDmpWorksSearch:
+    def test_writes_msearch_batches_in_order(self, tmp_path: pathlib.Path, mocker):
+        dmps = [SimpleNamespace(doi=f"10.0000/dmp{i}") for i in range(5)]
+
+        @contextmanager
+        def fake_fetch_dmps(**kwargs):
+            yield SimpleNamespace(total_dmps=len(dmps), dmps=iter(dmps))
+
+        def fake_msearch(client, index_name, batch, query_builder, **kwargs):
+            works = []
+            for dmp in batch:
+                work = MagicMock(dmp_doi=dmp.doi)
+                work.model_dump.return_value = {"doi": f"{dmp.doi}/work"}
+                works.append(work)
+            return works
+
+        mocker.patch("dmpworks.opensearch.dmp_works_search.make_opensearch_client")
+        mocker.patch("dmpworks.opensearch.dmp_works_search.fetch_dmps", side_effect=fake_fetch_dmps)
+        mock_msearch = mocker.patch("dmpworks.opensearch.dmp_works_search.msearch_dmp_works", side_effect=fake_msearch)
+
+        dmp_works_search("dmps-index", "works-index", tmp_path, MagicMock(), batch_size=2)
+
+        assert mock_msearch.call_count == 3
+        files = sorted(tmp_path.glob("*.jsonl.gz"))
+        records = [record for f in files for record in read_jsonl_gz(f)]
+        assert [record["dmpDoi"] for record in records] == [dmp.doi for dmp in dmps]
+
+
+    def test_runs_single_searches_concurrently_in_order(self, tmp_path: pathlib.Path, mocker):
+        dmps = [SimpleNamespace(doi=f"10.0000/dmp{i}") for i in range(6)]
+        in_flight = 0
+        max_in_flight = 0
+        lock = threading.Lock()
+
+        @contextmanager
+        def fake_fetch_dmps(**kwargs):
+            yield SimpleNamespace(total_dmps=len(dmps), dmps=iter(dmps))
+
+        def fake_search(client, index_name, dmp, query_builder, **kwargs):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            # Earlier DMPs finish last, so results must be reordered on write
+            time.sleep(0.01 * (len(dmps) - int(dmp.doi[-1])))
+            with lock:
+                in_flight -= 1
+            work = MagicMock(dmp_doi=dmp.doi)
+            work.model_dump.return_value = {"doi": f"{dmp.doi}/work"}
+            return [work]
+
+        mocker.patch("dmpworks.opensearch.dmp_works_search.make_opensearch_client")
+        mocker.patch("dmpworks.opensearch.dmp_works_search.fetch_dmps", side_effect=fake_fetch_dmps)
+        mock_search = mocker.patch("dmpworks.opensearch.dmp_works_search.search_dmp_works", side_effect=fake_search)
+
+        dmp_works_search("dmps-index", "works-index", tmp_path, MagicMock(), parallel_search=False, max_workers=3)
+
+        assert mock_search.call_count == len(dmps)
+        assert 1 < max_in_flight <= 3
+        files = sorted(tmp_path.glob("*.jsonl.gz"))
+        records = [record for f in files for record in read_jsonl_gz(f)]
+        assert [record["dmpDoi"] for record in records] == [dmp.doi for dmp in dmps]
+
+
+class TestToMsearchBodies:
+    def test_single_body_when_under_limit(self):
+        assert list(to_msearch_bodies(['{"a":1}', '{"b":2}'])) == ['{}\n{"a":1}\n{}\n{"b":2}\n']
+
+    def test_splits_bodies_by_size(self):
+        queries = ['{"q":"' + "x" * 10 + '"}'] * 3
+        line_size = len("{}\n" + queries[0] + "\n")
+
+        bodies = list(to_msearch_bodies(queries, max_bytes=line_size * 2))
+
+        assert bodies == ["{}\n" + queries[0] + "\n" + "{}\n" + queries[0] + "\n", "{}\n" + queries[0] + "\n"]
+
+    def test_oversized_query_sent_alone(self):
+        bodies = list(to_msearch_bodies(['{"q":"small"}', '{"q":"' + "x" * 100 + '"}'], max_bytes=50))
+
+        assert len(bodies) == 2
+
+    def test_no_queries(self):
+        assert list(to_msearch_bodies([])) == []
@@ -0,0 +1,23 @@
+import pathlib
+
+from dmpworks.opensearch.sync import stream_parquet_batches
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class TestStreamParquetBatches:
+    def test_yields_projected_batches_in_order(self, tmp_path: pathlib.Path):
+        path = tmp_path / "works.parquet"
+        pq.write_table(pa.table({"doi": [f"10.0000/{i}" for i in range(5)], "title": list("abcde")}), path)
+
+        batches = list(stream_parquet_batches(source=path, columns=["doi"], batch_size=2))
+
+        assert [batch.num_rows for batch in batches] == [2, 2, 1]
+        assert all(batch.schema.names == ["doi"] for batch in batches)
+        assert [doi for batch in batches for doi in batch["doi"].to_pylist()] == [f"10.0000/{i}" for i in range(5)]
+
+    def test_empty_file(self, tmp_path: pathlib.Path):
+        path = tmp_path / "works.parquet"
+        pq.write_table(pa.table({"doi": pa.array([], pa.string())}), path)
+
+        assert list(stream_parquet_batches(source=path, batch_size=2)) == []
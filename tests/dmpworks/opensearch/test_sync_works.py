@@ -0,0 +1,48 @@
+import datetime
+
+from dmpworks.opensearch.sync_works import batch_to_work_actions
+import pyarrow as pa
+
+
+class TestBatchToWorkActions:
+    def test_creates_upsert_actions(self):
+        batch = pa.RecordBatch.from_pydict(
+            {
+                "doi": ["10.0000/a", "10.0000/b"],
+                "title": ["A", None],
+                "publication_date": [datetime.date(2024, 1, 2), datetime.date(2024, 3, 4)],
+                "updated_date": [datetime.datetime(2025, 1, 1, 6, 30), datetime.datetime(2025, 1, 2, 7, 45)],
+                "authors": [[{"name": "Jane"}], []],
+            }
+        )
+
+        actions = list(batch_to_work_actions("works-index", batch))
+
+        assert actions == [
+            {
+                "_op_type": "update",
+                "_index": "works-index",
+                "_id": "10.0000/a",
+                "doc": {
+                    "doi": "10.0000/a",
+                    "title": "A",
+                    "publication_date": "2024-01-02",
+                    "updated_date": "2025-01-01T06:30Z",
+                    "authors": [{"name": "Jane"}],
+                },
+                "doc_as_upsert": True,
+            },
+            {
+                "_op_type": "update",
+                "_index": "works-index",
+                "_id": "10.0000/b",
+                "doc": {
+                    "doi": "10.0000/b",
+                    "title": None,
+                    "publication_date": "2024-03-04",
+                    "updated_date": "2025-01-02T07:45Z",
+                    "authors": [],
+                },
+                "doc_as_upsert": True,
+            },
+        ]
@@ -0,0 +1,50 @@
+from unittest.mock import MagicMock
+
+from dmpworks.cli_utils import OpenSearchClientConfig
+from dmpworks.opensearch.utils import make_opensearch_client, update_index_settings
+from opensearchpy.exceptions import OpenSearchException
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    make_opensearch_client.cache_clear()
+    yield
+    make_opensearch_client.cache_clear()
+
+
+class TestMakeOpenSearchClient:
+    def test_reuses_client_for_equal_config(self):
+        config = OpenSearchClientConfig(auth_type="basic", username="user", password="pass")
+
+        client = make_opensearch_client(config)
+
+        assert (
+            make_opensearch_client(OpenSearchClientConfig(auth_type="basic", username="user", password="pass"))
+            is client
+        )
+
+    def test_creates_new_client_for_different_config(self):
+        client = make_opensearch_client(OpenSearchClientConfig(auth_type="basic", username="user", password="pass"))
+
+        other = make_opensearch_client(
+            OpenSearchClientConfig(host="other", auth_type="basic", username="user", password="pass")
+        )
+
+        assert other is not client
+
+
+class TestUpdateIndexSettings:
+    def test_puts_settings(self):
+        client = MagicMock()
+
+        update_index_settings(client=client, index="works", settings={"refresh_interval": "-1"})
+
+        client.indices.put_settings.assert_called_once_with(index="works", body={"index": {"refresh_interval": "-1"}})
+
+    def test_raises_on_failure(self):
+        client = MagicMock()
+        client.indices.put_settings.side_effect = OpenSearchException("boom")
+
+        with pytest.raises(OpenSearchException):
+            update_index_settings(client=client, index="works", settings={"refresh_interval": "-1"})
@@ -1,10 +1,19 @@
+from functools import partial
+import gzip
+import io
+import logging
 import pathlib
+import subprocess
 
 from dmpworks.utils import (
     JsonlGzBatchWriter,
     ParquetBatchWriter,
+    gzip_stream,
     read_parquet_files,
+    run_concurrently,
+    run_piped_process,
     run_process,
+    setup_multiprocessing_logging,
     thread_map,
     write_rows_to_parquet,
 )
@@ -22,6 +31,19 @@ class TestThreadMap:
         assert thread_map(lambda x: x, []) == []
 
 
+class TestRunConcurrently:
+    def test_returns_results_in_order(self):
+        result = run_concurrently(partial(pow, 2, 3), partial(pow, 3, 2), lambda: "done")
+        assert result == [8, 9, "done"]
+
+    def test_empty_input(self):
+        assert run_concurrently() == []
+
+    def test_raises_task_errors(self):
+        with pytest.raises(ZeroDivisionError):
+            run_concurrently(lambda: 1 / 0)
+
+
 class TestRunProcess:
     def test_logs_command(self, caplog):
         cmd = ["echo", "hello world"]
@@ -31,6 +53,67 @@ class TestRunProcess:
         out = caplog.text
         assert "run_process command: `echo 'hello world'`" in out
 
+    def test_capture_stderr_on_error(self):
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            run_process(["sh", "-c", "echo out; echo err >&2; exit 1"], capture_stderr=True)
+
+        assert exc_info.value.stderr == "err\n"
+
+
+class TestRunPipedProcess:
+    def test_pipes_source_into_sink(self, caplog):
+        with caplog.at_level("INFO"):
+            run_piped_process(["printf", "hello\\nworld\\n"], ["tr", "a-z", "A-Z"])
+
+        out = caplog.text
+        assert "run_piped_process command: `printf 'hello\\nworld\\n' | tr a-z A-Z`" in out
+        assert "HELLO" in out
+        assert "WORLD" in out
+
+    def test_raises_when_source_fails(self):
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            run_piped_process(["false"], ["cat"])
+        assert exc_info.value.cmd == ["false"]
+
+    def test_raises_when_sink_fails(self):
+        with pytest.raises(subprocess.CalledProcessError) as exc_info:
+            run_piped_process(["echo", "hello"], ["false"])
+        assert exc_info.value.cmd == ["false"]
+
+
+class TestGzipStream:
+    def test_falls_back_to_gzip_module_without_pigz(self, tmp_path, mocker):
+        mocker.patch("dmpworks.utils.shutil.which", return_value=None)
+        out_path = tmp_path / "data.json.gz"
+
+        gzip_stream(io.BytesIO(b'{"id": 1}'), out_path)
+
+        assert gzip.decompress(out_path.read_bytes()) == b'{"id": 1}'
+
+    def test_uses_pigz_when_installed(self, tmp_path, mocker):
+        mocker.patch("dmpworks.utils.shutil.which", return_value="/usr/bin/pigz")
+        mock_popen = mocker.patch("dmpworks.utils.subprocess.Popen")
+        proc = mock_popen.return_value.__enter__.return_value
+        proc.stdin = io.BytesIO()
+        proc.returncode = 0
+
+        gzip_stream(io.BytesIO(b'{"id": 1}'), tmp_path / "data.json.gz", compresslevel=3)
+
+        assert mock_popen.call_args.args[0][:2] == ["pigz", "-3"]
+        assert proc.stdin.closed
+
+
+class TestSetupMultiprocessingLogging:
+    def test_configures_once_per_level(self, mocker):
+        mock_log_to_stderr = mocker.patch("dmpworks.utils.log_to_stderr")
+        setup_multiprocessing_logging.cache_clear()
+
+        setup_multiprocessing_logging(logging.DEBUG)
+        setup_multiprocessing_logging(logging.DEBUG)
+
+        mock_log_to_stderr.assert_called_once_with(logging.DEBUG)
+        setup_multiprocessing_logging.cache_clear()
+
 
 SIMPLE_SCHEMA = pa.schema(
     [
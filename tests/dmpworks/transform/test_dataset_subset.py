@@ -0,0 +1,90 @@
+import gzip
+import json
+import logging
+import pathlib
+from types import SimpleNamespace
+
+from dmpworks.model.common import Institution
+from dmpworks.transform import dataset_subset
+from dmpworks.transform.dataset_subset import create_dataset_subset, filter_dataset, init_subset_worker
+
+from tests.utils import read_jsonl_gz
+
+KEEP_ROR = "01an7q238"
+KEEP_NAME = "University of California, Berkeley"
+KEEP_DOI = "10.1234/keep-doi"
+
+
+def datacite_record(doi: str, affiliation: dict | None = None) -> dict:
+    """Build a minimal DataCite record with one creator."""
+    creator = {"name": "Smith, Jane", "affiliation": [affiliation] if affiliation is not None else []}
+    return {"id": doi, "attributes": {"creators": [creator]}}
+
+
+RECORDS = [
+    datacite_record("10.1234/by-ror", {"affiliationIdentifier": f"https://ror.org/{KEEP_ROR}", "name": "Other"}),
+    datacite_record("10.1234/by-name", {"name": f"  {KEEP_NAME.upper()} "}),
+    datacite_record(KEEP_DOI),
+    datacite_record("10.1234/other-ror", {"affiliationIdentifier": "https://ror.org/00000000", "name": "Other"}),
+    datacite_record("10.1234/no-affiliation"),
+]
+KEPT_DOIS = ["10.1234/by-ror", "10.1234/by-name", KEEP_DOI]
+
+
+def write_jsonl_gz(path: pathlib.Path, records: list[dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+class TestDatasetSubset:
+    def test_create_dataset_subset(self, tmp_path: pathlib.Path):
+        in_dir = tmp_path / "in"
+        out_dir = tmp_path / "out"
+        out_dir.mkdir()
+        write_jsonl_gz(in_dir / "updated_2024-01" / "part_0.jsonl.gz", RECORDS[:3])
+        write_jsonl_gz(in_dir / "updated_2024-02" / "part_0.jsonl.gz", RECORDS[3:])
+
+        create_dataset_subset(
+            dataset="datacite",
+            in_dir=in_dir,
+            out_dir=out_dir,
+            institutions=[Institution(name=KEEP_NAME, ror=KEEP_ROR)],
+            dois=[f"https://doi.org/{KEEP_DOI.upper()}"],
+        )
+
+        records = [record for f in sorted(out_dir.glob("*.jsonl.gz")) for record in read_jsonl_gz(f)]
+        assert sorted(record["id"] for record in records) == sorted(KEPT_DOIS)
+
+    def test_filter_dataset_uses_worker_filter_sets(self, tmp_path: pathlib.Path, mocker, monkeypatch):
+        # Restore the module filter sets after the test, as the initializer sets them
+        for name in ("INSTITUTION_RORS", "INSTITUTION_NAMES", "DOIS"):
+            monkeypatch.setattr(dataset_subset, name, getattr(dataset_subset, name))
+        mocker.patch(f"{dataset_subset.__name__}.current_process", return_value=SimpleNamespace(_identity=(1,)))
+        file_in = tmp_path / "in" / "part_0.jsonl.gz"
+        write_jsonl_gz(file_in, RECORDS)
+        out_dir = tmp_path / "out"
+        out_dir.mkdir()
+
+        init_subset_worker(
+            logging.INFO,
+            frozenset({KEEP_ROR}),
+            frozenset({KEEP_NAME.lower()}),
+            frozenset({KEEP_DOI}),
+        )
+        total = filter_dataset("datacite", file_in, out_dir)
+
+        assert total == len(KEPT_DOIS)
+        assert [record["id"] for record in read_jsonl_gz(out_dir / "part_001.jsonl.gz")] == KEPT_DOIS
+
+    def test_filter_dataset_keeps_nothing_without_filter_sets(self, tmp_path: pathlib.Path, mocker, monkeypatch):
+        for name in ("INSTITUTION_RORS", "INSTITUTION_NAMES", "DOIS"):
+            monkeypatch.setattr(dataset_subset, name, frozenset())
+        mocker.patch(f"{dataset_subset.__name__}.current_process", return_value=SimpleNamespace(_identity=(1,)))
+        file_in = tmp_path / "in" / "part_0.jsonl.gz"
+        write_jsonl_gz(file_in, RECORDS)
+        out_dir = tmp_path / "out"
+        out_dir.mkdir()
+
+        assert filter_dataset("datacite", file_in, out_dir) == 0
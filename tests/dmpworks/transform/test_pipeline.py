@@ -0,0 +1,37 @@
+import functools
+from unittest.mock import MagicMock
+
+from dmpworks.transform import pipeline
+from dmpworks.transform.pipeline import forkserver_preload_modules, set_forkserver_preload_once
+from dmpworks.transform.simdjson_transforms import clean_string
+from dmpworks.utils import to_batches
+
+
+class TestForkserverPreloadModules:
+    def test_includes_function_modules(self):
+        assert forkserver_preload_modules(to_batches, clean_string) == [
+            "pyarrow",
+            "pyarrow.parquet",
+            "simdjson",
+            "dmpworks.utils",
+            "dmpworks.transform.simdjson_transforms",
+        ]
+
+    def test_unwraps_partials(self):
+        transform_func = functools.partial(functools.partial(clean_string, lower=True))
+
+        modules = forkserver_preload_modules(to_batches, transform_func)
+
+        assert "dmpworks.transform.simdjson_transforms" in modules
+        assert "functools" not in modules
+
+
+class TestSetForkserverPreloadOnce:
+    def test_sets_preload_only_once(self, monkeypatch):
+        monkeypatch.setattr(pipeline, "FORKSERVER_PRELOAD_SET", False)
+        ctx = MagicMock()
+
+        set_forkserver_preload_once(ctx, to_batches)
+        set_forkserver_preload_once(ctx, clean_string)
+
+        ctx.set_forkserver_preload.assert_called_once_with(forkserver_preload_modules(to_batches))